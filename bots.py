@@ -0,0 +1,70 @@
+"""
+Simple computer players for headless simulation and benchmarks.
+
+A policy looks at an engine and returns the direction to set before the
+next tick.
+"""
+import random
+from typing import Callable, Dict, List
+
+from engine import SnakeEngine
+from rules import WALL
+
+Policy = Callable[[SnakeEngine, random.Random], str]
+
+DIRECTIONS: List[str] = ["left", "right", "up", "down"]
+OPPOSITE: Dict[str, str] = {"left": "right", "right": "left", "up": "down", "down": "up"}
+
+
+def safe_moves(engine: SnakeEngine) -> List[str]:
+    """Directions that do not kill the snake on the next tick."""
+    head = engine.snake_body[0]
+    moves = []
+    for direction in DIRECTIONS:
+        if direction == OPPOSITE[engine.direction]:
+            continue
+        target = engine.transitions[direction][head]
+        if target is WALL:
+            continue
+        if engine.rule.self_collision and target in engine.snake_body[1:]:
+            continue
+        moves.append(direction)
+    return moves
+
+
+def random_policy(engine: SnakeEngine, rng: random.Random) -> str:
+    """Keep going, occasionally turning at random (may crash)."""
+    if rng.random() < 0.2:
+        return rng.choice(DIRECTIONS)
+    return engine.direction
+
+
+def greedy_policy(engine: SnakeEngine, rng: random.Random) -> str:
+    """Take the safe move that gets closest to the food."""
+    moves = safe_moves(engine)
+    if not moves:
+        return engine.direction
+    rng.shuffle(moves)
+    fx, fy = engine.food_position
+    head = engine.snake_body[0]
+
+    def distance(direction: str) -> int:
+        x, y = engine.transitions[direction][head]
+        return abs(x - fx) + abs(y - fy)
+
+    return min(moves, key=distance)
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+def play_game(engine: SnakeEngine, policy: Policy, rng: random.Random, max_ticks: int) -> SnakeEngine:
+    """Let a policy play the engine's round until it ends or max_ticks pass."""
+    while engine.ticks < max_ticks:
+        engine.direction = policy(engine, rng)
+        if not engine.step():
+            break
+    return engine
@@ -0,0 +1,52 @@
+"""
+Global game constants shared by the Snake game GUI and its headless engine.
+"""
+
+# -----------------------------
+#     GLOBAL GAME CONSTANTS
+# -----------------------------
+GAME_WIDTH = 500         # The width of the playable area (pixels)
+GAME_HEIGHT = 500        # The height of the playable area (pixels)
+SNAKE_SIZE = 20          # Each cell of the grid is 20x20 pixels
+
+BG_COLOR_DEFAULT = "black"   # Default background color
+SNAKE_COLOR_DEFAULT = "lime" # Default snake color
+FOOD_COLOR = "red"           # Normal food color
+BONUS_FOOD_COLOR = "gold"    # Bonus food color
+OBSTACLE_COLOR = "yellow"    # Obstacles color
+
+BONUS_FOOD_DURATION = 5000   # Bonus food remains on the screen for this many ms
+NUM_OBSTACLES = 10           # Number of obstacles to generate (if obstacles mode is chosen)
+
+# Speeds & difficulty increments
+DIFFICULTY_SPEED = {
+    "easy": 130,
+    "medium": 100,
+    "hard": 70
+}
+DIFFICULTY_SPEED_INC = {
+    "easy": 5,
+    "medium": 7,
+    "hard": 10
+}
+
+# JSON file for storing multiple players' top scores
+HIGH_SCORES_JSON = "highscores.json"
+
+# Directory for replays of leaderboard games
+REPLAYS_DIR = "replays"
+
+# How often open games check the high-score file for outside changes (ms)
+LEADERBOARD_POLL_MS = 2000
+
+# Address `python -m snakegame verify --serve` binds by default
+VERIFY_HOST = "127.0.0.1"
+VERIFY_PORT = 8765
+
+# Verifier that re-simulates a game before its high score is saved, e.g.
+# "http://127.0.0.1:8765/verify" for `python -m snakegame verify --serve`.
+# None saves scores unverified; SNAKE_VERIFIER_URL overrides it.
+SCORE_VERIFIER_URL = None
+
+# How often the game checks for the verifier's answer (ms)
+VERIFY_POLL_MS = 100
@@ -0,0 +1,407 @@
+"""
+Headless Snake game engine.
+
+SnakeEngine owns the state of one round (snake, food, bonus food, obstacles,
+score and speed) and advances it one tick at a time. It has no Tkinter
+dependency; the GUI only reads its state to draw the board.
+
+For lookahead search, clone() copies an engine cheaply, and after
+enable_undo() every step() can be reverted with undo().
+"""
+import random
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from constants import (
+    GAME_WIDTH, GAME_HEIGHT, SNAKE_SIZE,
+    BONUS_FOOD_DURATION, DIFFICULTY_SPEED, DIFFICULTY_SPEED_INC
+)
+from levels import generate_obstacles
+from rules import DIRECTION_DELTAS, WALL, GameRule, TransitionTable, get_rule
+from timers import Timer, TimerWheel
+
+# Initial snake body (3 segments near the center)
+START_BODY: List[Tuple[int, int]] = [(240, 240), (220, 240), (200, 240)]
+START_DIRECTION = "right"
+START_CLEARANCE = 3  # free cells kept in front of the starting head
+
+
+def generate_all_cells() -> Set[Tuple[int, int]]:
+    """
+    Generate a set of all valid cells on the grid. Each cell corresponds
+    to a coordinate (x, y) multiple of SNAKE_SIZE, within the game’s dimensions.
+    """
+    cells = set()
+    x_cells = (GAME_WIDTH // SNAKE_SIZE)
+    y_cells = (GAME_HEIGHT // SNAKE_SIZE)
+    for ix in range(x_cells):
+        for iy in range(y_cells):
+            cells.add((ix * SNAKE_SIZE, iy * SNAKE_SIZE))
+    return cells
+
+
+class SnakeEngine:
+    """
+    Game state and rules for a single Snake round, independent of any GUI.
+    """
+
+    def __init__(
+        self,
+        game_mode: str = "classic",
+        difficulty: str = "medium",
+        time_limit: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Initializes the engine and starts the first round.
+
+        Args:
+            game_mode: Key of a registered GameRule ("classic", "portal", ...).
+            difficulty: "easy", "medium", or "hard" (affects speed).
+            time_limit: Round length in seconds for timed mode, None for untimed.
+            seed: Seed of the first round's random generator (random if None).
+        """
+        self.game_mode = game_mode
+        self.rule: GameRule = get_rule(game_mode)
+        self.difficulty = difficulty if difficulty in DIFFICULTY_SPEED else "medium"
+        self.time_limit = time_limit
+        self.rng = random.Random()
+        self.all_cells = generate_all_cells()
+        self.timers = TimerWheel()
+        # Undo entries of the steps taken so far; None while undo is off
+        self.history: Optional[List[Tuple[Any, ...]]] = None
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        Start a new round: reset the snake, score and speed, let the rule
+        prepare the board, compile the transition table and place food.
+
+        Each round draws from its own seeded generator, so the round can be
+        replayed exactly from its seed and input log.
+        """
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng.seed(self.seed)
+        self._rng_state = None  # cached rng.getstate(), valid right after an undo
+
+        # Input log: (tick, direction) whenever the direction changed before a tick
+        self.ticks = 0
+        self.inputs: List[Tuple[int, str]] = []
+        self.last_direction = START_DIRECTION
+
+        self.game_over = False
+        self.game_over_cause: Optional[str] = None  # "wall", "obstacle", "self" or "time"
+        self.score = 0
+        self.current_speed = DIFFICULTY_SPEED[self.difficulty]
+        # Game time (ms) that passes before the next tick; the first tick is immediate
+        self.tick_interval = 0
+        self.timers.clear()
+        if self.history is not None:
+            self.history = []
+
+        self.snake_body: List[Tuple[int, int]] = list(START_BODY)
+        self.direction = START_DIRECTION
+        self.occupied_cells = set(self.snake_body)
+
+        self.bonus_food_position: Optional[Tuple[int, int]] = None
+        self.bonus_food_active = False
+        self.bonus_food_timer: Optional[Timer] = None
+        self.food_position = (0, 0)
+
+        self.obstacles: List[Tuple[int, int]] = []
+        self.rule.setup(self)
+        self.transitions: TransitionTable = self.rule.compile_transitions(
+            self.all_cells, set(self.obstacles)
+        )
+
+        self.food_position = self.place_food()
+
+        # Timed mode countdown
+        self.time_left = self.time_limit
+        if self.time_limit is not None:
+            self.timers.schedule(1000, self.count_down, repeat=True)
+
+    # ----------------------------------------------------------------
+    #                     FOOD & OBSTACLE PLACEMENT
+    # ----------------------------------------------------------------
+
+    def place_food(self) -> Tuple[int, int]:
+        """
+        Randomly place normal food in a free cell not occupied by
+        the snake or obstacles.
+        """
+        free_cells = self.all_cells - self.occupied_cells
+        if free_cells:
+            return self.rng.choice(list(free_cells))
+        return 0, 0  # fallback
+
+    def place_bonus_food(self) -> Tuple[int, int]:
+        """
+        Randomly place bonus food in a free cell not occupied by
+        the snake, normal food, or obstacles.
+        """
+        temp_occupied = self.occupied_cells.union({self.food_position})
+        free_cells = self.all_cells - temp_occupied
+        if free_cells:
+            return self.rng.choice(list(free_cells))
+        return 0, 0
+
+    def create_obstacles(self, layout: str, density: float) -> None:
+        """
+        Generate obstacles with a level layout. The snake and the cells in
+        front of its head stay clear, and the remaining free space is
+        guaranteed to be one connected region, so food is always reachable.
+
+        Args:
+            layout: Level layout name ("scatter", "maze", "rooms", "symmetric").
+            density: Fraction of the board covered by obstacles.
+        """
+        keep_clear = set(self.snake_body)
+        (x, y), (dx, dy) = self.snake_body[0], DIRECTION_DELTAS[self.direction]
+        for step in range(1, START_CLEARANCE + 1):
+            keep_clear.add((x + dx * step, y + dy * step))
+
+        self.obstacles = generate_obstacles(layout, density, keep_clear & self.all_cells, self.rng)
+        self.occupied_cells.update(self.obstacles)
+
+    # ----------------------------------------------------------------
+    #                        TIMED EVENTS
+    # ----------------------------------------------------------------
+
+    def count_down(self) -> None:
+        """
+        Timed mode: called every second of game time; ends the round at zero.
+        """
+        self.time_left -= 1
+        if self.time_left <= 0:
+            self.game_over = True
+            self.game_over_cause = "time"
+
+    def expire_bonus_food(self) -> None:
+        """
+        Remove the bonus food once its duration has run out.
+        """
+        if self.bonus_food_position in self.occupied_cells:
+            self.occupied_cells.discard(self.bonus_food_position)
+        self.bonus_food_active = False
+        self.bonus_food_position = None
+        self.bonus_food_timer = None
+
+    # ----------------------------------------------------------------
+    #                        GAME TICK
+    # ----------------------------------------------------------------
+
+    def step(self) -> bool:
+        """
+        Advance the game by one tick:
+        1. Advance game time and fire due events (bonus expiry, countdown).
+        2. Look up the new head position in the transition table.
+        3. Check self-collision (if the rule enables it).
+        4. Move the snake, eating food or bonus food.
+        5. Possibly spawn bonus food.
+
+        Returns:
+            False if the round ended this tick, True otherwise.
+        """
+        if self.history is not None:
+            self.history.append(self._undo_entry())
+            self._rng_state = None
+
+        if self.direction != self.last_direction:
+            self.inputs.append((self.ticks, self.direction))
+            self.last_direction = self.direction
+        self.ticks += 1
+
+        self.timers.advance(self.tick_interval)
+        if self.game_over:
+            return False
+
+        new_head = self.transitions[self.direction][self.snake_body[0]]
+
+        # Walls and obstacles are compiled into the table
+        if new_head is WALL:
+            self.game_over = True
+            self.game_over_cause = self._wall_cause()
+            return False
+
+        if self.rule.self_collision and new_head in self.snake_body[1:]:
+            self.game_over = True
+            self.game_over_cause = "self"
+            return False
+
+        # Move the snake depending on whether we ate something
+        if new_head == self.food_position:
+            # Ate normal food
+            self.snake_body.insert(0, new_head)
+            self.occupied_cells.add(new_head)
+            self.score += 1
+
+            # Make the old food cell free
+            self.occupied_cells.discard(self.food_position)
+            # Place new food somewhere else
+            self.food_position = self.place_food()
+
+            # Increase speed slightly every 5 points
+            if self.score % 5 == 0:
+                inc = DIFFICULTY_SPEED_INC[self.difficulty]
+                self.current_speed = max(30, self.current_speed - inc)
+        else:
+            # Check if we ate bonus food
+            if self.bonus_food_active and new_head == self.bonus_food_position:
+                self.score += 3
+                self.timers.cancel(self.bonus_food_timer)
+                self.bonus_food_timer = None
+                self.bonus_food_active = False
+                self.occupied_cells.discard(self.bonus_food_position)
+                self.bonus_food_position = None
+            else:
+                # Normal movement: remove tail
+                tail = self.snake_body.pop()
+                self.occupied_cells.discard(tail)
+
+            # Now add new head
+            self.snake_body.insert(0, new_head)
+            self.occupied_cells.add(new_head)
+
+        # Possibly spawn bonus food with a small probability
+        if not self.bonus_food_active and self.rng.random() < 0.01:
+            self.bonus_food_position = self.place_bonus_food()
+            self.bonus_food_active = True
+            self.occupied_cells.add(self.bonus_food_position)
+            self.bonus_food_timer = self.timers.schedule(
+                BONUS_FOOD_DURATION, self.expire_bonus_food
+            )
+
+        # The GUI schedules the next tick with the (possibly sped-up) speed
+        self.tick_interval = self.current_speed
+        return True
+
+    def _wall_cause(self) -> str:
+        """Whether the blocked move hit an obstacle or the board edge."""
+        (x, y), (dx, dy) = self.snake_body[0], DIRECTION_DELTAS[self.direction]
+        x, y = x + dx, y + dy
+        if self.rule.wrap_edges:
+            x, y = x % GAME_WIDTH, y % GAME_HEIGHT
+        return "obstacle" if (x, y) in self.obstacles else "wall"
+
+    # ----------------------------------------------------------------
+    #                        CLONE & UNDO
+    # ----------------------------------------------------------------
+
+    def clone(self) -> "SnakeEngine":
+        """
+        Fast copy of the engine for lookahead search. Only the mutable
+        state is copied; the rule, cells, obstacles and transition table
+        are shared. The clone has its own (empty) undo history if undo is
+        enabled here.
+
+        Scheduled events are rebound to the clone, so they must be methods
+        of this engine (e.g. self.expire_bonus_food), not closures or
+        partials that would keep acting on the original.
+
+        Raises:
+            ValueError: If a scheduled event is not a method of this engine.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.snake_body = list(self.snake_body)
+        clone.occupied_cells = set(self.occupied_cells)
+        clone.inputs = list(self.inputs)
+        clone.rng = random.Random(0)
+        clone.rng.setstate(self._rng_state or self.rng.getstate())
+
+        def rebind(callback: Callable[[], None]) -> Callable[[], None]:
+            if getattr(callback, "__self__", None) is not self:
+                raise ValueError(f"cannot clone a timer whose callback is not an engine method: {callback!r}")
+            return getattr(clone, callback.__name__)
+
+        clone.timers = self.timers.copy(rebind)
+        if self.bonus_food_timer is not None:
+            timer = self.bonus_food_timer
+            clone.bonus_food_timer = clone.timers.slots.get(timer.slot, {}).get(timer.timer_id)
+        if self.history is not None:
+            clone.enable_undo()
+        return clone
+
+    def enable_undo(self, enabled: bool = True) -> None:
+        """
+        Start (or stop) recording an undo entry in every step().
+        Recording starts with an empty history.
+        """
+        self.history = [] if enabled else None
+        self.timers.journal = [] if enabled else None
+
+    def undo(self) -> None:
+        """
+        Revert the last step(). Each entry only holds what one tick can
+        change, so undoing costs the same however long the game is.
+        `direction` is the caller's input and is left as it is.
+
+        Raises:
+            IndexError: If there is no recorded step to undo.
+        """
+        if not self.history:
+            raise IndexError("No step to undo")
+        (
+            new_head, head_occupied, tail, tail_occupied, bonus_occupied, length,
+            ticks, last_direction, inputs, game_over, game_over_cause, score, current_speed,
+            tick_interval, time_left, food_position, bonus_food_position,
+            bonus_food_active, bonus_food_timer, rng_state, timer_mark
+        ) = self.history.pop()
+
+        # The snake moved if its head is on the new cell
+        if new_head is not WALL and self.snake_body[0] == new_head:
+            del self.snake_body[0]
+            if len(self.snake_body) < length:
+                self.snake_body.append(tail)
+
+        # Only these cells (and a newly spawned bonus cell) can change in a tick
+        occupied = self.occupied_cells
+        spawned = self.bonus_food_position
+        if spawned is not None and spawned not in (new_head, tail, bonus_food_position):
+            occupied.discard(spawned)
+        for cell, was_occupied in (
+            (bonus_food_position, bonus_occupied), (tail, tail_occupied), (new_head, head_occupied)
+        ):
+            if cell is None:
+                continue
+            if was_occupied:
+                occupied.add(cell)
+            else:
+                occupied.discard(cell)
+
+        self.ticks = ticks
+        self.last_direction = last_direction
+        del self.inputs[inputs:]
+        self.game_over = game_over
+        self.game_over_cause = game_over_cause
+        self.score = score
+        self.current_speed = current_speed
+        self.tick_interval = tick_interval
+        self.time_left = time_left
+        self.food_position = food_position
+        self.bonus_food_position = bonus_food_position
+        self.bonus_food_active = bonus_food_active
+        self.bonus_food_timer = bonus_food_timer
+        self.rng.setstate(rng_state)
+        self._rng_state = rng_state
+        self.timers.rollback(timer_mark)
+
+    def _undo_entry(self) -> Tuple[Any, ...]:
+        """
+        Everything the coming step() can change: the cells it may add to or
+        remove from the board, the scalar state, the RNG state and the
+        timer wheel position. Sibling moves tried after an undo share the
+        cached RNG state instead of copying it again.
+        """
+        new_head = self.transitions[self.direction][self.snake_body[0]]
+        tail = self.snake_body[-1]
+        occupied = self.occupied_cells
+        bonus = self.bonus_food_position
+        return (
+            new_head, new_head in occupied, tail, tail in occupied,
+            bonus in occupied, len(self.snake_body),
+            self.ticks, self.last_direction, len(self.inputs), self.game_over,
+            self.game_over_cause, self.score, self.current_speed, self.tick_interval, self.time_left,
+            self.food_position, bonus, self.bonus_food_active,
+            self.bonus_food_timer, self._rng_state or self.rng.getstate(), self.timers.mark()
+        )
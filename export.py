@@ -0,0 +1,428 @@
+"""
+Headless replay exporter: animated GIF or PNG sequence.
+
+A replay is re-simulated without Tk and rasterized into a NumPy palette
+framebuffer, using the same colors and shapes as the game window. Only the
+cells that changed in a tick are repainted, and only that region goes into
+the next GIF frame. Frames are encoded in a process pool; the main process
+just simulates, rasterizes and writes the encoded blocks in order.
+
+Requires numpy and Pillow (pip install numpy pillow).
+"""
+import io
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError as exc:  # optional dependencies, only needed for exporting
+    raise ImportError("Exporting replays requires numpy and Pillow: pip install numpy pillow") from exc
+
+from constants import (
+    GAME_WIDTH, GAME_HEIGHT, SNAKE_SIZE,
+    FOOD_COLOR, BONUS_FOOD_COLOR, OBSTACLE_COLOR
+)
+from engine import SnakeEngine
+from replay import play_back
+
+Cell = Tuple[int, int]
+
+# Palette indices of the framebuffer
+BG, OUTLINE, SNAKE, FOOD, BONUS, OBSTACLE = range(6)
+
+# Tk color names used by the game's constants; replays store the
+# player's colors as #rrggbb
+COLOR_RGB: Dict[str, Tuple[int, int, int]] = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "gold": (255, 215, 0),
+    "yellow": (255, 255, 0),
+    "lime": (0, 255, 0),
+}
+
+FINAL_FRAME_HOLD = 2000  # ms the last frame stays on screen
+CHUNK_FRAMES = 32        # frames per worker task
+MAX_PENDING = 16         # chunks in flight per worker
+
+
+def parse_color(color: str) -> Tuple[int, int, int]:
+    """Convert "#rrggbb" or one of COLOR_RGB's names to an RGB tuple."""
+    color = color.strip().lower()
+    if color.startswith("#") and len(color) == 7:
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+    if color in COLOR_RGB:
+        return COLOR_RGB[color]
+    raise ValueError(f"Unknown color {color!r}; use #rrggbb")
+
+
+# ----------------------------------------------------------------
+#                        RASTERIZATION
+# ----------------------------------------------------------------
+
+class FrameRasterizer:
+    """
+    Palette-indexed framebuffer of the board with dirty-cell updates,
+    mirroring draw_snake / draw_food / draw_obstacles.
+    """
+
+    def __init__(self, snake_shape: str = "square", cell_size: int = SNAKE_SIZE) -> None:
+        """
+        Args:
+            snake_shape: Shape of the snake segments ("square" or "circle").
+            cell_size: Output pixels per board cell.
+        """
+        self.cell_size = cell_size
+        self.frame = np.zeros(
+            (GAME_HEIGHT // SNAKE_SIZE * cell_size, GAME_WIDTH // SNAKE_SIZE * cell_size),
+            dtype=np.uint8
+        )
+        snake_tile = "circle" if snake_shape == "circle" else "square"
+        self.tiles = {
+            BG: np.full((cell_size, cell_size), BG, dtype=np.uint8),
+            SNAKE: self._tile(SNAKE, snake_tile),
+            FOOD: self._tile(FOOD, "square"),
+            BONUS: self._tile(BONUS, "circle"),
+            OBSTACLE: self._tile(OBSTACLE, "square"),
+        }
+        self.drawn: Dict[Cell, int] = {}
+        self.obstacles = set()
+        self.snake_cells: Dict[Cell, int] = {}  # snake cell -> segments on it
+        self.prev_head: Optional[Cell] = None
+        self.prev_length = 0
+        self.prev_tail: Optional[Cell] = None
+        self.prev_cells: List[Optional[Cell]] = []
+
+    def _tile(self, fill: int, shape: str) -> "np.ndarray":
+        """One cell sprite with a one-pixel outline, like the canvas shapes."""
+        size = self.cell_size
+        center = np.arange(size) + 0.5 - size / 2
+        if shape == "circle":
+            dist = np.sqrt(center[None, :] ** 2 + center[:, None] ** 2)
+            tile = np.where(dist <= size / 2, fill, BG).astype(np.uint8)
+            if size > 3:
+                tile[(dist > size / 2 - 1) & (dist <= size / 2)] = OUTLINE
+        else:
+            tile = np.full((size, size), fill, dtype=np.uint8)
+            if size > 3:
+                tile[[0, -1], :] = OUTLINE
+                tile[:, [0, -1]] = OUTLINE
+        return tile
+
+    def reset(self, engine: SnakeEngine) -> None:
+        """Paint the whole board for the start of a round."""
+        self.frame[:] = BG
+        self.drawn.clear()
+        self.obstacles = set(engine.obstacles)
+        self.snake_cells = {}
+        for cell in engine.snake_body:
+            self.snake_cells[cell] = self.snake_cells.get(cell, 0) + 1
+        cells = set(self.obstacles) | set(self.snake_cells) | {engine.food_position}
+        if engine.bonus_food_active and engine.bonus_food_position:
+            cells.add(engine.bonus_food_position)
+        for cell in cells:
+            self._blit(cell, self._sprite_at(cell, engine))
+        self._remember(engine)
+
+    def update(self, engine: SnakeEngine) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Repaint the cells that may have changed this tick.
+
+        Returns:
+            Pixel bounding box (x0, y0, x1, y1) of the repainted cells,
+            or None if nothing changed.
+        """
+        self._track_snake(engine)
+        bonus = engine.bonus_food_position if engine.bonus_food_active else None
+        box = None
+        for cell in [engine.snake_body[0], engine.food_position, bonus] + self.prev_cells:
+            if cell is None:
+                continue
+            sprite = self._sprite_at(cell, engine)
+            if self.drawn.get(cell, BG) == sprite:
+                continue
+            self._blit(cell, sprite)
+            x0, y0 = self._pixel(cell)
+            x1, y1 = x0 + self.cell_size, y0 + self.cell_size
+            if box is None:
+                box = (x0, y0, x1, y1)
+            else:
+                box = (min(box[0], x0), min(box[1], y0), max(box[2], x1), max(box[3], y1))
+        self._remember(engine)
+        return box
+
+    def _sprite_at(self, cell: Cell, engine: SnakeEngine) -> int:
+        """Sprite of a cell in canvas stacking order."""
+        if cell in self.obstacles:
+            return OBSTACLE
+        if engine.bonus_food_active and cell == engine.bonus_food_position:
+            return BONUS
+        if cell == engine.food_position:
+            return FOOD
+        if cell in self.snake_cells:
+            return SNAKE
+        return BG
+
+    def _track_snake(self, engine: SnakeEngine) -> None:
+        """
+        Follow the snake's move since the last draw: count the new head in,
+        and the old tail out unless the snake grew. Cells are counted
+        because a ghost snake can cover a cell twice.
+        """
+        head = engine.snake_body[0]
+        if head == self.prev_head:
+            return  # the round ended without a move
+        self.snake_cells[head] = self.snake_cells.get(head, 0) + 1
+        if len(engine.snake_body) == self.prev_length:
+            left = self.snake_cells.pop(self.prev_tail) - 1
+            if left:
+                self.snake_cells[self.prev_tail] = left
+
+    def _pixel(self, cell: Cell) -> Tuple[int, int]:
+        """Top-left output pixel of a board cell."""
+        return cell[0] // SNAKE_SIZE * self.cell_size, cell[1] // SNAKE_SIZE * self.cell_size
+
+    def _blit(self, cell: Cell, sprite: int) -> None:
+        x, y = self._pixel(cell)
+        self.frame[y:y + self.cell_size, x:x + self.cell_size] = self.tiles[sprite]
+        if sprite == BG:
+            self.drawn.pop(cell, None)
+        else:
+            self.drawn[cell] = sprite
+
+    def _remember(self, engine: SnakeEngine) -> None:
+        """Cells the next update has to re-check (tail, food, bonus)."""
+        self.prev_head = engine.snake_body[0]
+        self.prev_length = len(engine.snake_body)
+        self.prev_tail = engine.snake_body[-1]
+        self.prev_cells = [
+            engine.snake_body[-1],
+            engine.food_position,
+            engine.bonus_food_position if engine.bonus_food_active else None
+        ]
+
+
+def palette_for(replay: Dict[str, Any]) -> bytes:
+    """RGB palette bytes matching the framebuffer indices."""
+    colors = [
+        replay.get("bg_color", "black"),
+        "black",
+        replay.get("snake_color", "lime"),
+        FOOD_COLOR,
+        BONUS_FOOD_COLOR,
+        OBSTACLE_COLOR,
+        "black",
+        "black",
+    ]
+    return bytes(channel for color in colors for channel in parse_color(color))
+
+
+def iter_frames(
+    replay: Dict[str, Any],
+    cell_size: int = SNAKE_SIZE
+) -> Iterator[Tuple[Optional[Tuple[int, int, int, int]], "np.ndarray", int]]:
+    """
+    Re-simulate a replay and yield one entry per tick:
+    (changed box or None, framebuffer, ms until the next tick).
+    The first entry covers the whole board. The framebuffer is reused
+    between ticks, so copy whatever you need to keep.
+    """
+    rasterizer = FrameRasterizer(replay.get("snake_shape", "square"), cell_size)
+    height, width = rasterizer.frame.shape
+    for engine in play_back(replay):
+        if engine.ticks == 0:
+            rasterizer.reset(engine)
+            box = (0, 0, width, height)
+        else:
+            box = rasterizer.update(engine)
+        delay = engine.tick_interval or engine.current_speed
+        if engine.game_over:
+            delay = FINAL_FRAME_HOLD
+        yield box, rasterizer.frame, delay
+
+
+# ----------------------------------------------------------------
+#                           ENCODING
+# ----------------------------------------------------------------
+
+def _encode_gif_blocks(palette: bytes, crops: List[Tuple[int, int, "np.ndarray"]]) -> List[bytes]:
+    """
+    Worker: encode each (x, y, pixels) crop as a GIF image block
+    (image descriptor, local color table and LZW data).
+    """
+    blocks = []
+    for x, y, pixels in crops:
+        image = Image.fromarray(pixels, "P")
+        image.putpalette(palette)
+        buf = io.BytesIO()
+        image.save(buf, "GIF", optimize=False)
+        blocks.append(_image_block(buf.getvalue(), x, y))
+    return blocks
+
+
+def _image_block(gif: bytes, left: int, top: int) -> bytes:
+    """
+    Cut the image block out of a single-frame GIF file, moving its
+    global color table into a local one and setting its position.
+    """
+    packed = gif[10]
+    pos = 13
+    table = b""
+    if packed & 0x80:
+        table = gif[pos:pos + 3 * (2 << (packed & 7))]
+        pos += len(table)
+    while gif[pos] == 0x21:  # skip extensions
+        pos += 2
+        while gif[pos]:
+            pos += gif[pos] + 1
+        pos += 1
+
+    descriptor = bytearray(gif[pos:pos + 10])
+    pos += 10
+    struct.pack_into("<HH", descriptor, 1, left, top)
+    if not descriptor[9] & 0x80 and table:
+        descriptor[9] = (descriptor[9] & 0x40) | 0x80 | (packed & 7)
+        local_table = table
+    else:
+        local_table = b""
+
+    start = pos
+    pos += 1  # LZW minimum code size
+    while gif[pos]:
+        pos += gif[pos] + 1
+    return bytes(descriptor) + local_table + gif[start:pos + 1]
+
+
+def _encode_png_files(palette: bytes, frames: List[Tuple[str, "np.ndarray"]]) -> List[str]:
+    """Worker: write each (path, pixels) frame as a palette PNG."""
+    for path, pixels in frames:
+        image = Image.fromarray(pixels, "P")
+        image.putpalette(palette)
+        image.save(path, compress_level=1)
+    return [path for path, _ in frames]
+
+
+def _run_pipeline(jobs: Iterator[Tuple[Any, ...]], task, workers: Optional[int]) -> Iterator[Any]:
+    """
+    Submit chunked jobs to a process pool, keeping a bounded number in
+    flight, and yield the results in submission order.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        limit = MAX_PENDING * (workers or os.cpu_count() or 1)
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(task, *job))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def export_gif(
+    replay: Dict[str, Any],
+    path: str,
+    cell_size: int = SNAKE_SIZE,
+    speed: float = 1.0,
+    workers: Optional[int] = None
+) -> int:
+    """
+    Export a replay as a looping animated GIF.
+
+    Each GIF frame only contains the region that changed in its tick;
+    ticks without changes extend the previous frame's delay.
+
+    Args:
+        replay: Replay dict (see replay.record_replay).
+        path: Output .gif file.
+        cell_size: Output pixels per board cell.
+        speed: Playback speed multiplier.
+        workers: Encoder processes (default: one per CPU).
+
+    Returns:
+        Number of frames written.
+    """
+    palette = palette_for(replay)
+    delays: List[int] = []  # centiseconds per frame; may grow until the next frame exists
+
+    def jobs() -> Iterator[Tuple[bytes, List[Tuple[int, int, "np.ndarray"]]]]:
+        chunk = []
+        elapsed = shown = 0.0
+        for box, frame, delay in iter_frames(replay, cell_size):
+            if box is not None:
+                x0, y0, x1, y1 = box
+                chunk.append((x0, y0, frame[y0:y1, x0:x1].copy()))
+                delays.append(0)
+                if len(chunk) == CHUNK_FRAMES:
+                    yield palette, chunk
+                    chunk = []
+            # Spread the rounding to centiseconds over the whole clip
+            elapsed += delay / speed / 10
+            delays[-1] += round(elapsed) - round(shown)
+            shown = elapsed
+        if chunk:
+            yield palette, chunk
+
+    height = GAME_HEIGHT // SNAKE_SIZE * cell_size
+    width = GAME_WIDTH // SNAKE_SIZE * cell_size
+    count = 0
+    with open(path, "wb") as f:
+        f.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0x82, 0, 0) + palette)
+        f.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")  # loop forever
+        for blocks in _run_pipeline(jobs(), _encode_gif_blocks, workers):
+            for block in blocks:
+                # Graphic control: keep the previous frame underneath (disposal 1)
+                f.write(struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 0x04, max(delays[count], 2), 0, 0))
+                f.write(block)
+                count += 1
+        f.write(b"\x3b")
+    return count
+
+
+def export_png_sequence(
+    replay: Dict[str, Any],
+    directory: str,
+    cell_size: int = SNAKE_SIZE,
+    speed: float = 1.0,
+    workers: Optional[int] = None
+) -> int:
+    """
+    Export a replay as numbered PNG frames plus an ffmpeg concat list
+    (frames.txt) with each frame's duration, e.g. for
+    `ffmpeg -f concat -i frames.txt clip.mp4`.
+
+    Returns:
+        Number of frames written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    palette = palette_for(replay)
+    names: List[str] = []
+    durations: List[float] = []
+
+    def jobs() -> Iterator[Tuple[bytes, List[Tuple[str, "np.ndarray"]]]]:
+        chunk = []
+        for box, frame, delay in iter_frames(replay, cell_size):
+            if box is not None:
+                name = f"frame_{len(names):06d}.png"
+                names.append(name)
+                durations.append(0.0)
+                chunk.append((os.path.join(directory, name), frame.copy()))
+                if len(chunk) == CHUNK_FRAMES:
+                    yield palette, chunk
+                    chunk = []
+            durations[-1] += delay / speed / 1000
+        if chunk:
+            yield palette, chunk
+
+    for _ in _run_pipeline(jobs(), _encode_png_files, workers):
+        pass
+
+    with open(os.path.join(directory, "frames.txt"), "w", encoding="utf-8") as f:
+        for name, duration in zip(names, durations):
+            f.write(f"file '{name}'\nduration {duration:.3f}\n")
+        if names:
+            f.write(f"file '{names[-1]}'\n")  # ffmpeg needs the last file repeated
+    return len(names)
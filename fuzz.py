@@ -0,0 +1,570 @@
+"""
+Differential fuzzing of game engines against the reference rules.
+
+ReferenceEngine is a standalone port of the original SnakeGame: setup,
+food placement and one tick exactly like move_snake did (coordinate
+arithmetic, per-mode checks, list scans), without transition tables or other
+shortcuts, and without any SnakeEngine code. Every candidate engine
+registered in CANDIDATES is driven with the same seed and the same seeded
+random inputs as the reference, and their full state is compared after every
+tick. A divergence is shrunk to a minimal input sequence and reported as a
+replay dict, so it can be re-run with `python -m snakegame simulate --replay`.
+
+Bonus expiry and the timed-mode countdown were wall-clock events in the
+original game. Both run on game time now: the reference counts elapsed
+milliseconds, the engine uses its timer wheel.
+"""
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from bots import DIRECTIONS, OPPOSITE
+from constants import (
+    GAME_WIDTH, GAME_HEIGHT, SNAKE_SIZE, NUM_OBSTACLES,
+    BONUS_FOOD_DURATION, DIFFICULTY_SPEED, DIFFICULTY_SPEED_INC
+)
+from engine import SnakeEngine
+from levels import generate_obstacles
+from replay import REPLAY_VERSION
+
+Cell = Tuple[int, int]
+
+EngineFactory = Callable[[str, str, Optional[int], int], SnakeEngine]
+
+REFERENCE_MODES: List[str] = ["classic", "portal", "obstacles", "ghost"]
+TIME_LIMITS: List[Optional[int]] = [None, None, 10, 60]
+
+TURN_RATE = 0.15      # chance of a random (possibly fatal) turn instead of a greedy move
+CASES_PER_TASK = 16   # cases per worker task
+TIME_STEP_MS = 10     # game time resolution for bonus expiry (the engine's timer wheel tick)
+
+
+class ReferenceEngine:
+    """
+    Self-contained reference for one round, ported from the original
+    SnakeGame: its setup, food placement and move_snake tick, with the
+    wall-clock events replaced by a game-time counter. Nothing is shared
+    with SnakeEngine except the level generator for obstacles mode, so a
+    change to the engine's placement, randomness or timers shows up as a
+    divergence instead of changing the reference along with it.
+    """
+
+    def __init__(self, game_mode: str, difficulty: str, time_limit: Optional[int], seed: int) -> None:
+        self.game_mode = game_mode
+        self.difficulty = difficulty
+        self.time_limit = time_limit
+        self.rng = random.Random(seed)
+
+        # Same insertion order as the original, so set iteration (and with
+        # it every rng.choice over free cells) matches
+        self.all_cells: Set[Cell] = set()
+        for ix in range(GAME_WIDTH // SNAKE_SIZE):
+            for iy in range(GAME_HEIGHT // SNAKE_SIZE):
+                self.all_cells.add((ix * SNAKE_SIZE, iy * SNAKE_SIZE))
+
+        self.ticks = 0
+        self.game_over = False
+        self.game_over_cause: Optional[str] = None
+        self.score = 0
+        self.current_speed = DIFFICULTY_SPEED[difficulty]
+        self.tick_interval = 0
+        self.elapsed_ms = 0  # game time
+
+        self.snake_body: List[Cell] = [(240, 240), (220, 240), (200, 240)]
+        self.direction = "right"
+        self.occupied_cells = set(self.snake_body)
+
+        self.bonus_food_position: Optional[Cell] = None
+        self.bonus_food_active = False
+        self.bonus_food_expires = 0  # game time step at which the bonus food goes
+        self.food_position = (0, 0)
+
+        self.obstacles: List[Cell] = []
+        if game_mode == "obstacles":
+            self.create_obstacles()
+        self.food_position = self.place_food()
+
+        self.time_left = time_limit
+        self.next_second_ms = 1000
+
+    def place_food(self) -> Cell:
+        free_cells = self.all_cells - self.occupied_cells
+        if free_cells:
+            return self.rng.choice(list(free_cells))
+        return 0, 0  # fallback
+
+    def place_bonus_food(self) -> Cell:
+        temp_occupied = self.occupied_cells.union({self.food_position})
+        free_cells = self.all_cells - temp_occupied
+        if free_cells:
+            return self.rng.choice(list(free_cells))
+        return 0, 0
+
+    def create_obstacles(self) -> None:
+        """The default obstacles level: the snake and three cells ahead stay clear."""
+        keep_clear = set(self.snake_body)
+        x, y = self.snake_body[0]
+        for step in range(1, 4):
+            keep_clear.add((x + SNAKE_SIZE * step, y))
+        density = NUM_OBSTACLES / len(self.all_cells)
+        self.obstacles = generate_obstacles("scatter", density, keep_clear & self.all_cells, self.rng)
+        self.occupied_cells.update(self.obstacles)
+
+    def pass_time(self, elapsed_ms: int) -> None:
+        """
+        Let game time pass: count down every full second of a timed round,
+        and remove bonus food once it has been shown for BONUS_FOOD_DURATION.
+        Bonus time is counted in whole TIME_STEP_MS steps of game time.
+        """
+        self.elapsed_ms += elapsed_ms
+        while self.time_left is not None and self.elapsed_ms >= self.next_second_ms:
+            self.next_second_ms += 1000
+            self.time_left -= 1
+            if self.time_left <= 0:
+                self.game_over = True
+                self.game_over_cause = "time"
+        if self.bonus_food_active and self.elapsed_ms // TIME_STEP_MS >= self.bonus_food_expires:
+            if self.bonus_food_position in self.occupied_cells:
+                self.occupied_cells.discard(self.bonus_food_position)
+            self.bonus_food_active = False
+            self.bonus_food_position = None
+
+    def target(self, direction: str) -> Optional[Cell]:
+        """Where the head moves with `direction`, or None if that ends the round."""
+        dx, dy = {"left": (-1, 0), "right": (1, 0), "up": (0, -1), "down": (0, 1)}[direction]
+        head_x, head_y = self.snake_body[0]
+        head_x += dx * SNAKE_SIZE
+        head_y += dy * SNAKE_SIZE
+        if self.game_mode == "portal":
+            head_x %= GAME_WIDTH
+            head_y %= GAME_HEIGHT
+        elif head_x < 0 or head_x >= GAME_WIDTH or head_y < 0 or head_y >= GAME_HEIGHT:
+            return None
+        new_head = (head_x, head_y)
+        if new_head in self.obstacles:
+            return None
+        if self.game_mode != "ghost" and new_head in self.snake_body[1:]:
+            return None
+        return new_head
+
+    def step(self) -> bool:
+        """
+        Advance the game by one tick with the original move_snake rules.
+
+        Returns:
+            False if the round ended this tick, True otherwise.
+        """
+        self.ticks += 1
+
+        self.pass_time(self.tick_interval)
+        if self.game_over:
+            return False
+
+        head_x, head_y = self.snake_body[0]
+
+        # Adjust the head based on direction
+        if self.direction == "left":
+            head_x -= SNAKE_SIZE
+        elif self.direction == "right":
+            head_x += SNAKE_SIZE
+        elif self.direction == "up":
+            head_y -= SNAKE_SIZE
+        elif self.direction == "down":
+            head_y += SNAKE_SIZE
+
+        # "portal" mode wraps around edges
+        if self.game_mode == "portal":
+            head_x %= GAME_WIDTH
+            head_y %= GAME_HEIGHT
+        else:
+            # "classic", "obstacles", "ghost": check boundary collision
+            if head_x < 0 or head_x >= GAME_WIDTH or head_y < 0 or head_y >= GAME_HEIGHT:
+                self.game_over = True
+                self.game_over_cause = "wall"
+                return False
+
+        new_head = (head_x, head_y)
+
+        # Check collision with obstacles
+        if self.game_mode == "obstacles" and new_head in self.obstacles:
+            self.game_over = True
+            self.game_over_cause = "obstacle"
+            return False
+
+        # Check self-collision (unless "ghost" mode)
+        if self.game_mode != "ghost":
+            if new_head in self.snake_body[1:]:
+                self.game_over = True
+                self.game_over_cause = "self"
+                return False
+
+        # Move the snake depending on whether we ate something
+        if new_head == self.food_position:
+            # Ate normal food
+            self.snake_body.insert(0, new_head)
+            self.occupied_cells.add(new_head)
+            self.score += 1
+
+            # Make the old food cell free
+            self.occupied_cells.discard(self.food_position)
+            # Place new food somewhere else
+            self.food_position = self.place_food()
+
+            # Increase speed slightly every 5 points
+            if self.score % 5 == 0:
+                inc = DIFFICULTY_SPEED_INC[self.difficulty]
+                self.current_speed = max(30, self.current_speed - inc)
+        else:
+            # Check if we ate bonus food
+            if self.bonus_food_active and new_head == self.bonus_food_position:
+                self.score += 3
+                self.bonus_food_active = False
+                self.occupied_cells.discard(self.bonus_food_position)
+                self.bonus_food_position = None
+            else:
+                # Normal movement: remove tail
+                tail = self.snake_body.pop()
+                self.occupied_cells.discard(tail)
+
+            # Now add new head
+            self.snake_body.insert(0, new_head)
+            self.occupied_cells.add(new_head)
+
+        # Possibly spawn bonus food with a small probability
+        if not self.bonus_food_active and self.rng.random() < 0.01:
+            self.bonus_food_position = self.place_bonus_food()
+            self.bonus_food_active = True
+            self.bonus_food_expires = self.elapsed_ms // TIME_STEP_MS + math.ceil(BONUS_FOOD_DURATION / TIME_STEP_MS)
+            self.occupied_cells.add(self.bonus_food_position)
+
+        # The next tick comes after the (possibly sped-up) speed
+        self.tick_interval = self.current_speed
+        return True
+
+
+def reference_policy(reference: ReferenceEngine, rng: random.Random) -> str:
+    """
+    Greedy player judged by the reference rules: the move that does not end
+    the round and gets closest to the food (ties broken at random).
+    """
+    moves = [
+        direction for direction in DIRECTIONS
+        if direction != OPPOSITE[reference.direction] and reference.target(direction) is not None
+    ]
+    if not moves:
+        return reference.direction
+    rng.shuffle(moves)
+    fx, fy = reference.food_position
+
+    def distance(direction: str) -> int:
+        x, y = reference.target(direction)
+        return abs(x - fx) + abs(y - fy)
+
+    return min(moves, key=distance)
+
+
+# ----------------------------------------------------------------
+#                        CANDIDATE ENGINES
+# ----------------------------------------------------------------
+
+CANDIDATES: Dict[str, EngineFactory] = {}
+
+
+def register_candidate(name: str) -> Callable[[EngineFactory], EngineFactory]:
+    """
+    Decorator that registers an engine factory to be fuzzed against the
+    reference. The factory is called as factory(game_mode, difficulty,
+    time_limit, seed) and must return an object with SnakeEngine's state
+    attributes, `direction` setter and `step()`.
+    """
+    def decorator(factory: EngineFactory) -> EngineFactory:
+        CANDIDATES[name] = factory
+        return factory
+    return decorator
+
+
+@register_candidate("engine")
+def _snake_engine(game_mode: str, difficulty: str, time_limit: Optional[int], seed: int) -> SnakeEngine:
+    """The transition-table SnakeEngine used by the game."""
+    return SnakeEngine(game_mode, difficulty, time_limit=time_limit, seed=seed)
+
+
+class UndoCheckEngine(SnakeEngine):
+    """
+    SnakeEngine that exercises clone() and undo() on every tick: a clone
+    steps ahead and is thrown away, then the engine takes two steps, undoes
+    both and takes the real step.
+    """
+
+    def step(self) -> bool:
+        if self.history is None:
+            self.enable_undo()
+        SnakeEngine.step(self.clone())
+        super().step()
+        super().step()
+        self.undo()
+        self.undo()
+        return super().step()
+
+
+@register_candidate("undo")
+def _undo_engine(game_mode: str, difficulty: str, time_limit: Optional[int], seed: int) -> SnakeEngine:
+    """SnakeEngine checked through clone() and undo()."""
+    return UndoCheckEngine(game_mode, difficulty, time_limit=time_limit, seed=seed)
+
+
+# ----------------------------------------------------------------
+#                        STATE COMPARISON
+# ----------------------------------------------------------------
+
+def snapshot(engine: Any) -> Dict[str, Any]:
+    """
+    The full observable state of an engine, including its random generator,
+    so that any difference in how randomness is consumed shows up at once.
+    """
+    return {
+        "snake_body": tuple(engine.snake_body),
+        "direction": engine.direction,
+        "food_position": engine.food_position,
+        "bonus_food_position": engine.bonus_food_position,
+        "bonus_food_active": engine.bonus_food_active,
+        "obstacles": frozenset(engine.obstacles),
+        "occupied_cells": frozenset(engine.occupied_cells),
+        "score": engine.score,
+        "current_speed": engine.current_speed,
+        "tick_interval": engine.tick_interval,
+        "time_left": engine.time_left,
+        "game_over": engine.game_over,
+        "game_over_cause": engine.game_over_cause,
+        "ticks": engine.ticks,
+        "rng": engine.rng.getstate()
+    }
+
+
+def diff_states(expected: Dict[str, Any], actual: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Fields whose values differ, as {field: [expected, actual]}."""
+    return {
+        key: [_plain(value), _plain(actual[key])]
+        for key, value in expected.items() if actual[key] != value
+    }
+
+
+def _plain(value: Any) -> Any:
+    """Make a state value JSON friendly (sorted lists instead of sets)."""
+    if isinstance(value, frozenset):
+        return sorted(value)
+    if isinstance(value, tuple) and len(value) == 3 and isinstance(value[1], tuple):
+        return "<rng state>"
+    return value
+
+
+# ----------------------------------------------------------------
+#                        RUNNING CASES
+# ----------------------------------------------------------------
+
+def run_case(
+    case: Dict[str, Any],
+    inputs: Optional[List[str]] = None,
+    max_ticks: int = 2000
+) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+    """
+    Run the reference and the case's candidate engine side by side.
+
+    Without `inputs`, directions are generated from the case seed by an
+    epsilon-greedy player that watches the reference engine.
+
+    Args:
+        case: Dict with candidate, game_mode, difficulty, time_limit and seed.
+        inputs: The direction to set before each tick, or None to generate.
+        max_ticks: Tick limit when generating inputs.
+
+    Returns:
+        The inputs that were played (one direction per tick) and the first
+        divergence ({tick, fields}) or None.
+    """
+    settings = (case["game_mode"], case["difficulty"], case["time_limit"], case["seed"])
+    reference = ReferenceEngine(*settings)
+    try:
+        candidate = CANDIDATES[case["candidate"]](*settings)
+        divergence = _compare(reference, candidate, 0)
+    except Exception as exc:  # a crashing candidate is a divergence too
+        return inputs or [], {"tick": 0, "error": repr(exc)}
+    if divergence:
+        return inputs or [], divergence
+
+    played: List[str] = []
+    policy_rng = random.Random(case["seed"] * 2 + 1)
+    limit = len(inputs) if inputs is not None else max_ticks
+    while len(played) < limit:
+        if inputs is not None:
+            direction = inputs[len(played)]
+        elif policy_rng.random() < TURN_RATE:
+            # Reversing into the neck only survives in ghost mode; elsewhere
+            # it would end most cases after a few dozen ticks
+            if reference.game_mode == "ghost":
+                direction = policy_rng.choice(DIRECTIONS)
+            else:
+                direction = policy_rng.choice([d for d in DIRECTIONS if d != OPPOSITE[reference.direction]])
+        else:
+            direction = reference_policy(reference, policy_rng)
+        played.append(direction)
+
+        reference.direction = direction
+        alive = reference.step()
+        try:
+            candidate.direction = direction
+            candidate.step()
+            divergence = _compare(reference, candidate, len(played))
+        except Exception as exc:
+            return played, {"tick": len(played), "error": repr(exc)}
+        if divergence or not alive:
+            return played, divergence
+    return played, None
+
+
+def _compare(reference: ReferenceEngine, candidate: SnakeEngine, tick: int) -> Optional[Dict[str, Any]]:
+    """The divergence record at `tick`, or None if both states match."""
+    expected, actual = snapshot(reference), snapshot(candidate)
+    if expected == actual:
+        return None
+    return {"tick": tick, "fields": diff_states(expected, actual)}
+
+
+def shrink(
+    case: Dict[str, Any],
+    inputs: List[str],
+    divergence: Dict[str, Any]
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Reduce a diverging input sequence while it keeps diverging: cut it at
+    the divergence, delete ever smaller chunks of ticks (delta debugging),
+    then replace turns with "keep going" wherever possible.
+
+    Returns:
+        The minimal inputs and their divergence.
+    """
+    def diverges(candidate_inputs: List[str]) -> Optional[Dict[str, Any]]:
+        return run_case(case, candidate_inputs)[1]
+
+    inputs = inputs[:divergence["tick"]]
+
+    chunk = max(1, len(inputs) // 2)
+    while chunk >= 1:
+        start = 0
+        while start < len(inputs):
+            trial = inputs[:start] + inputs[start + chunk:]
+            result = diverges(trial)
+            if result:
+                inputs, divergence = trial[:result["tick"]], result
+            else:
+                start += chunk
+        chunk //= 2
+
+    for idx in range(len(inputs)):
+        previous = inputs[idx - 1] if idx else case_start_direction(case)
+        if inputs[idx] != previous:
+            trial = inputs[:idx] + [previous] + inputs[idx + 1:]
+            result = diverges(trial)
+            if result:
+                inputs, divergence = trial, result
+    return inputs, divergence
+
+
+def case_start_direction(case: Dict[str, Any]) -> str:
+    """The direction the snake has before the first tick."""
+    return ReferenceEngine(case["game_mode"], case["difficulty"], case["time_limit"], case["seed"]).direction
+
+
+def to_replay(case: Dict[str, Any], inputs: List[str]) -> Dict[str, Any]:
+    """Turn per-tick inputs into a replay dict (see replay.record_replay)."""
+    changes, direction = [], case_start_direction(case)
+    for tick, new_direction in enumerate(inputs):
+        if new_direction != direction:
+            changes.append([tick, new_direction])
+            direction = new_direction
+    return {
+        "version": REPLAY_VERSION,
+        "seed": case["seed"],
+        "game_mode": case["game_mode"],
+        "difficulty": case["difficulty"],
+        "time_limit": case["time_limit"],
+        "inputs": changes,
+        "ticks": len(inputs),
+        "score": None,
+        "player": f"fuzz:{case['candidate']}"
+    }
+
+
+def fuzz_cases(cases: List[Dict[str, Any]], max_ticks: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Worker task: run cases and shrink the diverging ones.
+
+    Returns:
+        The number of ticks simulated and one report per divergence.
+    """
+    ticks, reports = 0, []
+    for case in cases:
+        inputs, divergence = run_case(case, max_ticks=max_ticks)
+        ticks += len(inputs)
+        if divergence is None:
+            continue
+        original_ticks = len(inputs)
+        if "error" not in divergence:
+            inputs, divergence = shrink(case, inputs, divergence)
+        reports.append({
+            "case": case,
+            "original_ticks": original_ticks,
+            "divergence": divergence,
+            "replay": to_replay(case, inputs)
+        })
+    return ticks, reports
+
+
+def make_cases(candidates: List[str], count: int, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Random fuzz cases covering every mode, difficulty and timed setting."""
+    rng = random.Random(seed)
+    for idx in range(count):
+        yield {
+            "candidate": candidates[idx % len(candidates)],
+            "game_mode": rng.choice(REFERENCE_MODES),
+            "difficulty": rng.choice(list(DIFFICULTY_SPEED)),
+            "time_limit": rng.choice(TIME_LIMITS),
+            "seed": rng.randrange(2 ** 32)
+        }
+
+
+def fuzz(
+    candidates: Optional[List[str]] = None,
+    cases: int = 1000,
+    max_ticks: int = 2000,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Fuzz candidate engines against the reference across a process pool.
+
+    Args:
+        candidates: Names from CANDIDATES (default: all of them).
+        cases: Number of random games to play.
+        max_ticks: Tick limit per game.
+        workers: Worker processes (default: one per CPU).
+        seed: Seed for reproducible case generation.
+
+    Returns:
+        Dict with the number of cases and ticks and the divergence reports.
+    """
+    names = candidates or list(CANDIDATES)
+    unknown = [name for name in names if name not in CANDIDATES]
+    if unknown:
+        raise ValueError(f"Unknown candidate engine(s): {', '.join(unknown)}")
+
+    all_cases = list(make_cases(names, cases, seed))
+    tasks = [all_cases[i:i + CASES_PER_TASK] for i in range(0, len(all_cases), CASES_PER_TASK)]
+
+    ticks, reports = 0, []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for task_ticks, task_reports in pool.map(fuzz_cases, tasks, [max_ticks] * len(tasks)):
+            ticks += task_ticks
+            reports.extend(task_reports)
+    return {"candidates": names, "cases": len(all_cases), "ticks": ticks, "divergences": reports}
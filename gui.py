@@ -0,0 +1,813 @@
+"""
+Tkinter GUI of the Snake game: the settings menu and the game window.
+"""
+import tkinter as tk
+import os
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
+
+import telemetry
+from constants import (
+    GAME_WIDTH, GAME_HEIGHT, SNAKE_SIZE,
+    BG_COLOR_DEFAULT, SNAKE_COLOR_DEFAULT, FOOD_COLOR, BONUS_FOOD_COLOR, OBSTACLE_COLOR,
+    DIFFICULTY_SPEED, LEADERBOARD_POLL_MS, SCORE_VERIFIER_URL, VERIFY_POLL_MS
+)
+from engine import SnakeEngine
+from i18n import Localizer, available_languages
+from renderer import RasterRenderer
+from replay import delete_replay, record_replay, save_replay
+from rules import GAME_RULES
+from scores import LeaderboardCache, get_leaderboard
+from verify import verify_score
+
+
+class SnakeGame:
+    """
+    Main game class for handling logic, drawing, modes (classic, portal, obstacles, ghost),
+    timed play, and multiple player high scores in a JSON file.
+    """
+
+    def __init__(
+        self,
+        master: tk.Toplevel,
+        language: str = "en",
+        game_mode: str = "classic",
+        timed_mode: bool = False,
+        game_time: int = 30,
+        difficulty: str = "medium",
+        snake_color: str = SNAKE_COLOR_DEFAULT,
+        bg_color: str = BG_COLOR_DEFAULT,
+        snake_shape: str = "square",
+        player_name: str = "Player",
+        renderer: str = "canvas",
+        localizer: Optional[Localizer] = None
+    ) -> None:
+        """
+        Initializes a new SnakeGame instance.
+
+        Args:
+            master: Parent Tkinter widget or Toplevel window.
+            language: The UI language code ("en", "es", "fr", ...).
+            game_mode: Key of a registered rule ("classic", "portal", "obstacles", "maze", ...).
+            timed_mode: If True, the game is limited to 'game_time' seconds.
+            game_time: The total seconds allowed if timed_mode is True.
+            difficulty: "easy", "medium", or "hard" (affects speed).
+            snake_color: The color of the snake segments.
+            bg_color: The canvas background color.
+            snake_shape: Shape of the snake segments ("square" or "circle").
+            player_name: The player's displayed name for the high score table.
+            renderer: "canvas" (one canvas item per shape) or "raster"
+                (the whole board in a single PhotoImage).
+            localizer: Shared Localizer; switching its language retranslates
+                this window live. If None, the game uses its own for `language`.
+        """
+        self.master = master
+        self.master.focus_set()  # Ensure focus for key events
+
+        # Store settings
+        self.language = language
+        self.game_mode = game_mode.lower().strip()
+        self.timed_mode = timed_mode
+        self.game_time = max(game_time, 1)
+        self.difficulty = difficulty.lower().strip()
+        self.snake_color = snake_color
+        self.bg_color = bg_color
+        self.snake_shape = snake_shape.lower()
+        self.player_name = player_name.strip() or "Player"
+
+        # Fallback if invalid difficulty
+        if self.difficulty not in DIFFICULTY_SPEED:
+            self.difficulty = "medium"
+
+        # UI text for the current language
+        self.i18n = localizer or Localizer(self.language)
+
+        # Game state: snake, food, obstacles and score live in the headless engine,
+        # whose mode rule places obstacles and compiles the movement table
+        self.game_over = False
+        self.paused = False
+        self.engine = SnakeEngine(
+            self.game_mode,
+            self.difficulty,
+            time_limit=self.game_time if self.timed_mode else None
+        )
+
+        # Telemetry: round start and when the next tick is due (None = no expectation)
+        self.session_start = time.perf_counter()
+        self.next_tick_due: Optional[float] = None
+
+        # Multiple high scores, shared with every open game through the leaderboard cache
+        self.leaderboard = get_leaderboard()
+        self.high_scores = self.load_high_scores()  # retrieve list of top {player, score} dicts
+        self.high_score = max([d["score"] for d in self.high_scores], default=0)
+
+        # UI elements
+        self.score_label = tk.Label(
+            self.master,
+            text=f"{self.texts['SCORE_LABEL']}{self.engine.score}",
+            font=("Arial", 14),
+            bg="gray20", fg="white"
+        )
+        self.score_label.pack(fill=tk.X)
+
+        # Display highest score (single best)
+        self.high_score_label = tk.Label(
+            self.master,
+            text=f"{self.texts['HIGH_SCORE_LABEL']}{self.high_score}",
+            font=("Arial", 12),
+            bg="gray20", fg="white"
+        )
+        self.high_score_label.pack(fill=tk.X)
+
+        # Display top 5 leaderboard
+        self.leaderboard_label = tk.Label(
+            self.master,
+            text=self.texts["LEADERBOARD_LABEL"],
+            font=("Arial", 12, "bold"),
+            bg="gray20", fg="white"
+        )
+        self.leaderboard_label.pack(fill=tk.X)
+        self.leaderboard_frame = tk.Frame(self.master, bg="gray20")
+        self.leaderboard_frame.pack(fill=tk.X)
+        self.leaderboard_rows: List[tk.Label] = []
+        self.show_leaderboard()
+
+        # Follow score changes made by other windows or processes
+        self.leaderboard.subscribe(self.on_leaderboard_change)
+        self.master.bind("<Destroy>", self.on_destroy, add="+")
+        watch_leaderboard(self.master, self.leaderboard)
+
+        # Create canvas
+        self.canvas = tk.Canvas(
+            self.master,
+            bg=self.bg_color,
+            height=GAME_HEIGHT,
+            width=GAME_WIDTH
+        )
+        self.canvas.pack()
+
+        # Timed mode setup
+        if self.timed_mode:
+            self.time_label = tk.Label(
+                self.master,
+                text=self.texts["TIME_LEFT_LABEL"].format(self.engine.time_left),
+                font=("Arial", 14),
+                bg="gray20", fg="white"
+            )
+            self.time_label.pack(fill=tk.X)
+
+        # Retranslate this window in place whenever the language changes
+        self.i18n.on_change(self.retranslate, self.master)
+
+        # Raster renderer paints the board into one image instead of canvas shapes
+        self.raster: Optional[RasterRenderer] = None
+        if renderer.lower().strip() == "raster":
+            self.raster = RasterRenderer(self.canvas, self.snake_color, self.bg_color, self.snake_shape)
+
+        # Draw initial items
+        self.draw_board()
+
+        # Key bindings
+        self.master.bind("<Left>", self.go_left)
+        self.master.bind("<Right>", self.go_right)
+        self.master.bind("<Up>", self.go_up)
+        self.master.bind("<Down>", self.go_down)
+        self.master.bind("p", self.toggle_pause)
+        self.master.bind("<Return>", self.restart_game)
+
+        # Pause automatically if window loses focus
+        self.master.bind("<FocusOut>", self.on_focus_out)
+
+        # Start the main loop
+        self.move_snake()
+
+    # ----------------------------------------------------------------
+    #                  LEADERBOARD & UI
+    # ----------------------------------------------------------------
+
+    @property
+    def texts(self) -> Dict[str, any]:
+        """Text catalog of the current UI language."""
+        return self.i18n.texts
+
+    def retranslate(self, texts: Dict[str, any]) -> None:
+        """
+        Update every text of the game window to the given catalog,
+        reusing the existing widgets and canvas items.
+        """
+        self.master.title(texts["GAME_TITLE"])
+        self.score_label.config(text=f"{texts['SCORE_LABEL']}{self.engine.score}")
+        self.high_score_label.config(text=f"{texts['HIGH_SCORE_LABEL']}{self.high_score}")
+        self.leaderboard_label.config(text=texts["LEADERBOARD_LABEL"])
+        if self.timed_mode:
+            self.time_label.config(text=texts["TIME_LEFT_LABEL"].format(self.engine.time_left))
+        self.canvas.itemconfig("game_over_msg", text=texts["GAME_OVER_TEXT"])
+        self.canvas.itemconfig("pause_msg", text=texts["RESUME_TEXT"])
+
+    def show_leaderboard(self) -> None:
+        """
+        Display the top 5 {player, score} entries in the self.leaderboard_frame.
+        Existing row labels are reused and only rows whose text changed
+        are updated.
+        """
+        top_five = self.high_scores[:5]  # top 5
+        lines = [f"{idx}. {entry['player']} - {entry['score']}" for idx, entry in enumerate(top_five, start=1)]
+
+        while len(self.leaderboard_rows) > len(lines):
+            self.leaderboard_rows.pop().destroy()
+        for idx, line in enumerate(lines):
+            if idx == len(self.leaderboard_rows):
+                lbl = tk.Label(
+                    self.leaderboard_frame,
+                    text=line,
+                    font=("Arial", 10),
+                    bg="gray20", fg="white",
+                    anchor="w"
+                )
+                lbl.pack(fill=tk.X, padx=10)
+                self.leaderboard_rows.append(lbl)
+            elif self.leaderboard_rows[idx].cget("text") != line:
+                self.leaderboard_rows[idx].config(text=line)
+
+    def on_leaderboard_change(self, entries: List[Dict[str, any]]) -> None:
+        """
+        Called by the leaderboard cache when the high scores changed,
+        here or in another window or process.
+        """
+        self.high_scores = entries
+        best_score = max((d["score"] for d in entries), default=0)
+        if best_score != self.high_score:
+            self.high_score = best_score
+            self.high_score_label.config(text=f"{self.texts['HIGH_SCORE_LABEL']}{self.high_score}")
+        self.show_leaderboard()
+
+    def on_destroy(self, event) -> None:
+        """Stop following the leaderboard once the game window is closed."""
+        if event.widget is self.master:
+            self.leaderboard.unsubscribe(self.on_leaderboard_change)
+
+    def on_focus_out(self, event) -> None:
+        """
+        Automatically pause the game when the window loses focus.
+        """
+        if not self.game_over and not self.paused:
+            self.toggle_pause(None)
+
+    # ----------------------------------------------------------------
+    #                  DRAWING & CANVAS UPDATES
+    # ----------------------------------------------------------------
+
+    def draw_board(self) -> None:
+        """
+        Paint the whole board from scratch (start of a round).
+        """
+        if self.raster:
+            self.raster.reset(self.engine)
+            return
+        self.draw_snake()
+        self.draw_food()
+        self.draw_obstacles()
+
+    def redraw(self) -> None:
+        """
+        Bring the board up to date after a tick. The raster renderer
+        only repaints the cells that changed.
+        """
+        if self.raster:
+            self.raster.draw(self.engine)
+            return
+        self.draw_snake()
+        self.draw_food()
+        self.draw_obstacles()
+
+    def draw_snake(self) -> None:
+        """
+        Clear any existing snake drawing and redraw the snake body
+        segments in their current positions.
+        """
+        self.canvas.delete("snake")
+        for (x, y) in self.engine.snake_body:
+            if self.snake_shape == "circle":
+                self.canvas.create_oval(
+                    x, y, x + SNAKE_SIZE, y + SNAKE_SIZE,
+                    fill=self.snake_color,
+                    tag="snake"
+                )
+            else:  # default to square
+                self.canvas.create_rectangle(
+                    x, y, x + SNAKE_SIZE, y + SNAKE_SIZE,
+                    fill=self.snake_color, tag="snake"
+                )
+
+    def draw_food(self) -> None:
+        """
+        Clear any existing food drawings (normal & bonus) and
+        redraw them at their current positions.
+        """
+        self.canvas.delete("food")
+        fx, fy = self.engine.food_position
+        self.canvas.create_rectangle(
+            fx, fy, fx + SNAKE_SIZE, fy + SNAKE_SIZE,
+            fill=FOOD_COLOR, tag="food"
+        )
+
+        # Bonus food
+        self.canvas.delete("bonus_food")
+        if self.engine.bonus_food_active and self.engine.bonus_food_position:
+            bx, by = self.engine.bonus_food_position
+            self.canvas.create_oval(
+                bx, by, bx + SNAKE_SIZE, by + SNAKE_SIZE,
+                fill=BONUS_FOOD_COLOR, tag="bonus_food"
+            )
+
+    def draw_obstacles(self) -> None:
+        """
+        Clear any existing obstacle drawings, then draw each obstacle
+        as a rectangle on the canvas.
+        """
+        self.canvas.delete("obstacle")
+        for (ox, oy) in self.engine.obstacles:
+            self.canvas.create_rectangle(
+                ox, oy, ox + SNAKE_SIZE, oy + SNAKE_SIZE,
+                fill=OBSTACLE_COLOR, tag="obstacle"
+            )
+
+    # ----------------------------------------------------------------
+    #                        GAME LOOP
+    # ----------------------------------------------------------------
+
+    def move_snake(self) -> None:
+        """
+        Main game loop function:
+        1. Advance the engine by one tick (game time, movement, collisions, food).
+        2. End the game if the snake died or the time ran out.
+        3. Redraw everything and schedule the next move.
+        """
+        if self.game_over:
+            return
+
+        if self.paused:
+            # If the game is paused, just wait 100ms and check again
+            self.next_tick_due = None
+            self.master.after(100, self.move_snake)
+            return
+
+        frame_start = time.perf_counter()
+        lag = frame_start - self.next_tick_due if self.next_tick_due is not None else None
+
+        score_before = self.engine.score
+        time_before = self.engine.time_left
+        alive = self.engine.step()
+
+        if self.engine.score != score_before:
+            self.score_label.config(text=f"{self.texts['SCORE_LABEL']}{self.engine.score}")
+        if self.timed_mode and self.engine.time_left != time_before:
+            self.time_label.config(text=self.texts["TIME_LEFT_LABEL"].format(self.engine.time_left))
+
+        if not alive:
+            telemetry.record_tick(self.game_mode, time.perf_counter() - frame_start, lag)
+            self.end_game()
+            return
+
+        # Redraw the snake, food, obstacles
+        self.redraw()
+
+        # Schedule the next movement step
+        self.master.after(self.engine.current_speed, self.move_snake)
+        now = time.perf_counter()
+        telemetry.record_tick(self.game_mode, now - frame_start, lag)
+        self.next_tick_due = now + self.engine.current_speed / 1000
+
+    # ----------------------------------------------------------------
+    #                   END / RESTART GAME
+    # ----------------------------------------------------------------
+
+    def end_game(self) -> None:
+        """
+        Sets the game_over flag, updates high scores, and displays a
+        game-over message on the canvas.
+        """
+        self.game_over = True
+        telemetry.record_game_over(
+            self.game_mode,
+            self.difficulty,
+            self.engine.game_over_cause,
+            time.perf_counter() - self.session_start,
+            self.engine.score,
+            self.engine.ticks
+        )
+        self.update_high_scores()
+        self.canvas.create_text(
+            GAME_WIDTH / 2,
+            GAME_HEIGHT / 2,
+            text=self.texts["GAME_OVER_TEXT"],
+            fill="white",
+            font=("Arial", 20, "bold"),
+            tag="game_over_msg"
+        )
+
+    def restart_game(self, event) -> None:
+        """
+        Resets the entire game state (snake, food, score, etc.)
+        and starts a new round without closing the window.
+        """
+        if not self.game_over:
+            return
+
+        self.game_over = False
+        self.paused = False
+        self.engine.reset()
+        self.session_start = time.perf_counter()
+        self.next_tick_due = None
+        self.score_label.config(text=f"{self.texts['SCORE_LABEL']}{self.engine.score}")
+
+        # Recalculate the best score among current top scores
+        self.high_score = max((d["score"] for d in self.high_scores), default=0)
+        self.high_score_label.config(text=f"{self.texts['HIGH_SCORE_LABEL']}{self.high_score}")
+
+        # Clear canvas and redraw
+        self.canvas.delete("all")
+        self.draw_board()
+
+        # Reset timer
+        if self.timed_mode:
+            self.time_label.config(text=self.texts["TIME_LEFT_LABEL"].format(self.engine.time_left))
+
+        # Resume loop
+        self.move_snake()
+
+    # ----------------------------------------------------------------
+    #                  KEYBOARD CONTROLS
+    # ----------------------------------------------------------------
+
+    def go_left(self, event) -> None:
+        """Change the direction to left if not currently going right."""
+        if self.engine.direction != "right":
+            self.engine.direction = "left"
+
+    def go_right(self, event) -> None:
+        """Change the direction to right if not currently going left."""
+        if self.engine.direction != "left":
+            self.engine.direction = "right"
+
+    def go_up(self, event) -> None:
+        """Change the direction to up if not currently going down."""
+        if self.engine.direction != "down":
+            self.engine.direction = "up"
+
+    def go_down(self, event) -> None:
+        """Change the direction to down if not currently going up."""
+        if self.engine.direction != "up":
+            self.engine.direction = "down"
+
+    def toggle_pause(self, event) -> None:
+        """
+        Pauses or resumes the game if it's not over.
+        Displays a pause message on the canvas.
+        """
+        if self.game_over:
+            return
+
+        self.paused = not self.paused
+        if self.paused:
+            self.canvas.create_text(
+                GAME_WIDTH / 2,
+                GAME_HEIGHT / 2,
+                text=self.texts["RESUME_TEXT"],
+                fill="white",
+                font=("Arial", 18, "bold"),
+                tag="pause_msg"
+            )
+        else:
+            self.canvas.delete("pause_msg")
+
+    # ----------------------------------------------------------------
+    #        MULTIPLE HIGH SCORES (JSON-based)
+    # ----------------------------------------------------------------
+
+    def load_high_scores(self) -> List[Dict[str, any]]:
+        """
+        Load multiple scores from the JSON file, if it exists,
+        returning a list of dicts: [{"player": str, "score": int}, ...].
+        Sorted descending by "score". Served from the shared leaderboard cache.
+        """
+        return list(self.leaderboard.get())
+
+    def save_high_scores(self, data: List[Dict[str, any]]) -> None:
+        """
+        Persists the updated list of {player, score} dicts into the JSON file.
+        Only the write is timed; the notified windows redraw afterwards.
+        """
+        with telemetry.SAVE_LATENCY.time():
+            self.leaderboard.write(data)
+        self.leaderboard.notify()
+
+    def update_high_scores(self) -> None:
+        """
+        Add the current {player_name, score} to the leaderboard if it makes
+        the top 5 (see add_high_score).
+
+        With a score verifier configured (SCORE_VERIFIER_URL, or the
+        SNAKE_VERIFIER_URL environment variable), the replay is sent to it
+        on a background thread first and the result is applied on the Tk
+        thread: a score the replay does not reproduce is not saved, and one
+        the verifier could not check is saved with "verified": False.
+        """
+        entry = {"player": self.player_name, "score": self.engine.score}
+        if not any(d is entry for d in self.rank_high_score(entry)[0]):
+            return
+        replay = self.record_replay()
+        url = os.environ.get("SNAKE_VERIFIER_URL", SCORE_VERIFIER_URL)
+        if not url:
+            self.add_high_score(entry, replay)
+            return
+
+        result = {}
+
+        def check() -> None:
+            try:
+                result.update(verify_score(replay, url))
+            except Exception:  # unreachable, timed out or a broken reply
+                result["valid"] = None
+
+        worker = threading.Thread(target=check, daemon=True)
+        worker.start()
+        root = self.master.nametowidget(".")
+
+        def apply() -> None:
+            if worker.is_alive():
+                root.after(VERIFY_POLL_MS, apply)
+                return
+            if result["valid"] is False:
+                return  # rejected: leave the leaderboard as it was
+            entry["verified"] = bool(result["valid"])
+            self.add_high_score(entry, replay)
+
+        root.after(VERIFY_POLL_MS, apply)
+
+    def rank_high_score(self, entry: Dict[str, any]) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+        """
+        The current leaderboard with `entry` inserted, as (top 5, dropped).
+        """
+        self.leaderboard.refresh()  # pick up scores saved elsewhere first
+        data = self.load_high_scores()
+        data.append(entry)
+        data.sort(key=lambda d: d["score"], reverse=True)
+        return data[:5], data[5:]
+
+    def add_high_score(self, entry: Dict[str, any], replay: Dict[str, any]) -> None:
+        """
+        Insert `entry` into the leaderboard, keep only the top 5, and update
+        displayed high scores. Entries that make the top 5 keep a replay of
+        their game; replays of entries that drop out are deleted.
+        """
+        data, dropped = self.rank_high_score(entry)
+        if not any(d is entry for d in data):
+            return  # pushed out by scores saved while it was being verified
+        entry["replay"] = save_replay(replay)
+        for old in dropped:
+            if old.get("replay"):
+                delete_replay(old["replay"])
+
+        # The cache notifies every open game, this one included, which
+        # updates the high score label and the leaderboard rows
+        self.save_high_scores(data)
+
+    def record_replay(self) -> Dict[str, any]:
+        """
+        Replay of the current round, with colors resolved to #rrggbb
+        so it can be rendered without Tk.
+        """
+        def to_hex(color: str) -> str:
+            r, g, b = self.canvas.winfo_rgb(color)
+            return f"#{r >> 8:02x}{g >> 8:02x}{b >> 8:02x}"
+
+        return record_replay(
+            self.engine,
+            player_name=self.player_name,
+            snake_color=to_hex(self.snake_color),
+            bg_color=to_hex(self.bg_color),
+            snake_shape=self.snake_shape
+        )
+
+
+class SettingsMenu:
+    """
+    A settings menu for configuring:
+    - Language (one per catalog in locales/)
+    - Player Name
+    - Game mode (classic, portal, obstacles, ghost)
+    - Timed mode and duration
+    - Difficulty (easy, medium, hard)
+    - Snake color / background color
+    - Snake shape (square / circle)
+    - Renderer (canvas / raster)
+    """
+
+    def __init__(self, master: tk.Tk) -> None:
+        """
+        Sets up the settings menu with default values for
+        language, game mode, timing, difficulty, shapes, and colors.
+        """
+        self.master = master
+        self.language_var = tk.StringVar(value="en")
+
+        # Start with English as default text; games started from this menu
+        # share the localizer, so they follow later language switches too
+        self.i18n = Localizer("en")
+        self.i18n.bind_title(self.master, "SETTINGS_TITLE")
+
+        # Create the menu layout
+        self.create_widgets()
+        # After widgets are created, set up language radio buttons
+        self.create_language_widgets()
+
+    def create_widgets(self) -> None:
+        """Create all main widgets, bound to their text in the current language."""
+        bind = self.i18n.bind
+
+        # Player name
+        bind(tk.Label(self.master), "PLAYER_NAME_LABEL").pack()
+        self.player_name_entry = tk.Entry(self.master)
+        self.player_name_entry.insert(0, "Player")
+        self.player_name_entry.pack()
+
+        # Frame for game mode
+        self.game_mode_var = tk.StringVar(value="classic")
+        bind(tk.Label(self.master), "GAME_MODE_LABEL").pack()
+        modes_frame = tk.Frame(self.master)
+        modes_frame.pack()
+
+        for mode_key in GAME_RULES:
+            rb = tk.Radiobutton(
+                modes_frame,
+                variable=self.game_mode_var,
+                value=mode_key
+            )
+            bind(rb, render=lambda texts, key=mode_key: texts["GAME_MODES"].get(key, key.title()))
+            rb.pack(side=tk.LEFT, padx=5)
+
+        # Timed mode checkbox
+        self.timed_var = tk.BooleanVar()
+        bind(tk.Checkbutton(self.master, variable=self.timed_var), "TIMED_GAME_CHECK").pack()
+
+        # Game time input
+        bind(tk.Label(self.master), "TIME_LABEL").pack()
+        self.time_entry = tk.Entry(self.master)
+        self.time_entry.insert(0, "30")  # default
+        self.time_entry.pack()
+
+        # Difficulty selection
+        self.diff_var = tk.StringVar(value="medium")
+        bind(tk.Label(self.master), "DIFFICULTY_LABEL").pack()
+        diff_frame = tk.Frame(self.master)
+        diff_frame.pack()
+
+        for diff_key in ["easy", "medium", "hard"]:
+            rb = tk.Radiobutton(
+                diff_frame,
+                variable=self.diff_var,
+                value=diff_key
+            )
+            bind(rb, render=lambda texts, key=diff_key: texts["DIFFICULTIES"][key])
+            rb.pack(side=tk.LEFT, padx=5)
+
+        # Snake color
+        bind(tk.Label(self.master), "SNAKE_COLOR_LABEL").pack()
+        self.snake_color_entry = tk.Entry(self.master)
+        self.snake_color_entry.insert(0, SNAKE_COLOR_DEFAULT)
+        self.snake_color_entry.pack()
+
+        # Background color
+        bind(tk.Label(self.master), "BG_COLOR_LABEL").pack()
+        self.bg_color_entry = tk.Entry(self.master)
+        self.bg_color_entry.insert(0, BG_COLOR_DEFAULT)
+        self.bg_color_entry.pack()
+
+        # Snake shape
+        bind(tk.Label(self.master), "SNAKE_SHAPE_LABEL").pack()
+        self.snake_shape_entry = tk.Entry(self.master)
+        self.snake_shape_entry.insert(0, "square")
+        self.snake_shape_entry.pack()
+
+        # Renderer
+        bind(tk.Label(self.master), "RENDERER_LABEL").pack()
+        self.renderer_entry = tk.Entry(self.master)
+        self.renderer_entry.insert(0, "canvas")
+        self.renderer_entry.pack()
+
+        # Start button
+        self.start_button = tk.Button(self.master, command=self.start_game)
+        bind(self.start_button, "START_BUTTON").pack(pady=10)
+
+    def create_language_widgets(self) -> None:
+        """
+        Create radio buttons for language selection, one per catalog file.
+        Catalogs are only loaded when their language is selected.
+        """
+        lang_frame = tk.Frame(self.master)
+        lang_frame.pack(pady=5)
+
+        # A label for "Language:"
+        self.i18n.bind(tk.Label(lang_frame), "LANGUAGE_LABEL").pack(side=tk.LEFT, padx=5)
+
+        for lang_code in available_languages():
+            rb = tk.Radiobutton(
+                lang_frame,
+                text=lang_code.upper(),
+                variable=self.language_var,
+                value=lang_code,
+                command=self.change_language
+            )
+            rb.pack(side=tk.LEFT, padx=5)
+
+    def change_language(self) -> None:
+        """
+        Called when user selects a different language radio button.
+        Retranslates the menu and every open game window in place;
+        typed-in values are kept.
+        """
+        self.i18n.set_language(self.language_var.get())
+
+    def start_game(self) -> None:
+        """
+        Validate user input, then create a new Toplevel window
+        and launch the SnakeGame with chosen settings.
+        """
+        game_mode = self.game_mode_var.get()
+        timed_mode = self.timed_var.get()
+
+        # Validate the game time
+        try:
+            game_time = int(self.time_entry.get())
+        except ValueError:
+            game_time = 30
+
+        difficulty = self.diff_var.get()
+        snake_color = self.snake_color_entry.get()
+        bg_color = self.bg_color_entry.get()
+        snake_shape = self.snake_shape_entry.get().lower().strip()
+        renderer = self.renderer_entry.get().lower().strip()
+        player_name = self.player_name_entry.get()
+
+        # Create a new top-level window for the actual game
+        game_window = tk.Toplevel(self.master)
+        SnakeGame(
+            master=game_window,
+            language=self.language_var.get(),
+            game_mode=game_mode,
+            timed_mode=timed_mode,
+            game_time=game_time,
+            difficulty=difficulty,
+            snake_color=snake_color,
+            bg_color=bg_color,
+            snake_shape=snake_shape,
+            player_name=player_name,
+            renderer=renderer,
+            localizer=self.i18n
+        )
+
+
+def watch_leaderboard(widget: tk.Misc, cache: LeaderboardCache) -> None:
+    """
+    Poll the leaderboard file for outside changes every LEADERBOARD_POLL_MS
+    while any game follows it. Polling runs on the Tk root, so it outlives
+    the window that started it, and is started only once per cache.
+    """
+    if cache.watching:
+        return
+    cache.watching = True
+    root = widget.nametowidget(".")
+
+    def poll() -> None:
+        if not cache.subscribers:
+            cache.watching = False
+            return
+        root.after(LEADERBOARD_POLL_MS, poll)  # re-arm first, so an error cannot stop polling
+        cache.refresh()
+
+    root.after(LEADERBOARD_POLL_MS, poll)
+
+
+def run(telemetry_dir: Optional[str] = None, telemetry_interval: float = telemetry.DEFAULT_INTERVAL) -> None:
+    """
+    Create the Tk root window, set up the SettingsMenu,
+    and start the GUI event loop.
+
+    Args:
+        telemetry_dir: If set, metrics and events are exported there
+            by a background thread while the game runs.
+        telemetry_interval: Seconds between telemetry exports.
+    """
+    exporter = None
+    if telemetry_dir:
+        exporter = telemetry.TelemetryExporter(telemetry_dir, telemetry_interval).start()
+
+    root = tk.Tk()
+    SettingsMenu(root)
+    try:
+        root.mainloop()
+    finally:
+        if exporter is not None:
+            exporter.stop()
@@ -0,0 +1,134 @@
+"""
+Localization layer for the Snake game UI.
+
+UI text lives in one JSON catalog per language (locales/<code>.json), loaded
+lazily the first time a language is used. Widgets are bound to catalog keys
+through a Localizer, so switching languages updates every bound widget in
+place instead of destroying and rebuilding the UI.
+"""
+import json
+import os
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+DEFAULT_LANGUAGE = "en"
+
+Catalog = Dict[str, Any]
+
+_catalogs: Dict[str, Catalog] = {}  # process-wide cache of loaded catalogs
+
+
+def available_languages(locales_dir: str = LOCALES_DIR) -> List[str]:
+    """
+    Language codes that have a catalog file (without reading the files).
+    """
+    try:
+        names = os.listdir(locales_dir)
+    except OSError:
+        return [DEFAULT_LANGUAGE]
+    codes = sorted(name[:-5] for name in names if name.endswith(".json"))
+    return codes or [DEFAULT_LANGUAGE]
+
+
+def load_catalog(language: str, locales_dir: str = LOCALES_DIR) -> Catalog:
+    """
+    Load (once) the catalog of a language. Keys missing from it fall back
+    to the default language; unknown languages get the default catalog.
+    """
+    if language in _catalogs:
+        return _catalogs[language]
+
+    catalog: Catalog = {}
+    if language != DEFAULT_LANGUAGE:
+        catalog = _merge(catalog, load_catalog(DEFAULT_LANGUAGE, locales_dir))
+    try:
+        with open(os.path.join(locales_dir, f"{language}.json"), "r", encoding="utf-8") as f:
+            catalog = _merge(catalog, json.load(f))
+    except (OSError, json.JSONDecodeError):
+        if language != DEFAULT_LANGUAGE:
+            return load_catalog(DEFAULT_LANGUAGE, locales_dir)
+
+    _catalogs[language] = catalog
+    return catalog
+
+
+def _merge(base: Catalog, override: Catalog) -> Catalog:
+    """Merge two catalogs, recursing into nested groups like GAME_MODES."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class Localizer:
+    """
+    Current UI language plus a registry of widgets bound to its text.
+    """
+
+    def __init__(self, language: str = DEFAULT_LANGUAGE) -> None:
+        self.language = language
+        self.texts: Catalog = load_catalog(language)
+        self.bindings: List[Tuple[Callable[[Catalog], None], Optional[tk.Misc]]] = []
+
+    def bind(
+        self,
+        widget: tk.Misc,
+        key: Optional[str] = None,
+        render: Optional[Callable[[Catalog], str]] = None,
+        option: str = "text"
+    ) -> tk.Misc:
+        """
+        Bind a widget option to a catalog key, or to render(texts) for
+        text that is built from several keys or values. The option is set
+        right away and again on every language switch.
+
+        Returns:
+            The widget, so calls can be chained with pack().
+        """
+        def update(texts: Catalog) -> None:
+            widget.config(**{option: render(texts) if render else texts[key]})
+
+        self.on_change(update, widget)
+        return widget
+
+    def bind_title(self, window: tk.Wm, key: str) -> None:
+        """Bind a window title to a catalog key."""
+        self.on_change(lambda texts: window.title(texts[key]), window)
+
+    def on_change(self, callback: Callable[[Catalog], None], owner: Optional[tk.Misc] = None) -> None:
+        """
+        Call callback(texts) now and after every language switch.
+        The binding is dropped once its owner widget is destroyed.
+        """
+        callback(self.texts)
+        self.bindings.append((callback, owner))
+
+    def set_language(self, language: str) -> None:
+        """
+        Switch to another language and update every bound widget in place.
+        """
+        self.language = language
+        self.texts = load_catalog(language)
+
+        alive = []
+        for callback, owner in self.bindings:
+            if owner is not None and not _exists(owner):
+                continue
+            try:
+                callback(self.texts)
+            except tk.TclError:
+                continue  # its widgets were destroyed
+            alive.append((callback, owner))
+        self.bindings = alive
+
+
+def _exists(widget: tk.Misc) -> bool:
+    """True if the Tk widget has not been destroyed."""
+    try:
+        return bool(widget.winfo_exists())
+    except tk.TclError:
+        return False
@@ -0,0 +1,515 @@
+"""
+Procedural obstacle layouts for the Snake game.
+
+Each layout fills a cols x rows grid with walls at roughly the requested
+density. After generation, the protected cells (e.g. the snake's start) are
+cleared and the free space is made one connected region in linear time:
+unreachable pockets are filled in, then the reachable region either regrows
+into random bordering walls or loses random leaves of a spanning tree until
+the density is on target. Symmetric layouts instead carve mirrored paths
+found with a 0-1 BFS, then wall off leaves of a spanning tree of their
+top-left quadrant together with their mirrors. No retry loops.
+"""
+import random
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from constants import GAME_WIDTH, GAME_HEIGHT, SNAKE_SIZE
+
+Cell = Tuple[int, int]
+Grid = bytearray  # one byte per cell (index = y * cols + x), 1 = wall
+
+MAX_DENSITY = 0.9  # always leave room for the snake and food
+
+# Registered layout builders: (cols, rows, density, rng) -> Grid
+LAYOUTS: Dict[str, Callable[[int, int, float, random.Random], Grid]] = {}
+
+
+def register_layout(name: str):
+    """
+    Decorator that registers a layout builder under the given name.
+    """
+    def decorator(builder):
+        LAYOUTS[name] = builder
+        return builder
+    return decorator
+
+
+# ----------------------------------------------------------------
+#                        LAYOUT BUILDERS
+# ----------------------------------------------------------------
+
+@register_layout("scatter")
+def scatter_layout(cols: int, rows: int, density: float, rng: random.Random) -> Grid:
+    """Walls on uniformly random cells."""
+    walls = bytearray(cols * rows)
+    for idx in rng.sample(range(cols * rows), round(density * cols * rows)):
+        walls[idx] = 1
+    return walls
+
+
+@register_layout("maze")
+def maze_layout(cols: int, rows: int, density: float, rng: random.Random) -> Grid:
+    """
+    A perfect maze (recursive backtracker on every other cell), thinned out
+    by knocking down random walls until the density is reached. Denser
+    boards than a perfect maze (about 0.46) fill in its dead ends.
+    """
+    walls = bytearray(b"\x01" * (cols * rows))
+    walls[0] = 0
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        neighbors = [
+            (x + dx, y + dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 <= x + dx < cols and 0 <= y + dy < rows and walls[(y + dy) * cols + x + dx]
+        ]
+        if not neighbors:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(neighbors)
+        walls[((y + ny) // 2) * cols + (x + nx) // 2] = 0
+        walls[ny * cols + nx] = 0
+        stack.append((nx, ny))
+    _thin_out(walls, density, rng)
+    return walls
+
+
+@register_layout("rooms")
+def rooms_layout(cols: int, rows: int, density: float, rng: random.Random) -> Grid:
+    """
+    Rectangular rooms separated by wall lines, with one door between every
+    pair of neighboring rooms. The rooms are as large as the density allows;
+    boards denser than the smallest rooms (about 0.44) fill in parts of the
+    rooms.
+    """
+    if density <= 0:
+        return bytearray(cols * rows)
+    # Widest spacing whose wall lines still reach the density
+    target = round(density * cols * rows)
+    spacing = 3
+    while spacing < max(cols, rows) and _room_lines(cols, rows, spacing + 1).count(1) >= target:
+        spacing += 1
+    walls = _room_lines(cols, rows, spacing)
+
+    # One door in each wall segment between two rooms
+    for line in range(spacing - 1, cols - 1, spacing):
+        for start in range(0, rows, spacing):
+            span = range(start, min(start + spacing - 1, rows))
+            if span:
+                walls[rng.choice(span) * cols + line] = 0
+    for line in range(spacing - 1, rows - 1, spacing):
+        for start in range(0, cols, spacing):
+            span = range(start, min(start + spacing - 1, cols))
+            if span:
+                walls[line * cols + rng.choice(span)] = 0
+
+    _thin_out(walls, density, rng)
+    return walls
+
+
+@register_layout("symmetric")
+def symmetric_layout(cols: int, rows: int, density: float, rng: random.Random) -> Grid:
+    """Random walls in the top-left quadrant, mirrored into the other three."""
+    walls = bytearray(cols * rows)
+    half_cols, half_rows = (cols + 1) // 2, (rows + 1) // 2
+    quadrant = half_cols * half_rows
+    for idx in rng.sample(range(quadrant), round(density * quadrant)):
+        for mirror in _mirrors(idx % half_cols, idx // half_cols, cols, rows):
+            walls[mirror] = 1
+    return walls
+
+
+# ----------------------------------------------------------------
+#                      CONNECTIVITY REPAIR
+# ----------------------------------------------------------------
+# The repair works on a copy of the grid padded with a one-cell wall border,
+# so the neighbors of a cell are always idx +/- 1 and idx +/- width.
+
+def label_regions(walls: Grid, cols: int, rows: int) -> Tuple[List[int], int]:
+    """
+    Flood-fill the free cells into connected regions.
+
+    Returns:
+        (labels, count): labels[idx] is the region number of a free cell
+        (-1 for walls), count is the number of regions.
+    """
+    width = cols + 2
+    padded = _pad(walls, cols, rows)
+    labels = [-1] * len(padded)
+    count = 0
+    for start in range(len(padded)):
+        if padded[start] or labels[start] != -1:
+            continue
+        labels[start] = count
+        stack = [start]
+        while stack:
+            idx = stack.pop()
+            for nxt in (idx - 1, idx + 1, idx - width, idx + width):
+                if not padded[nxt] and labels[nxt] == -1:
+                    labels[nxt] = count
+                    stack.append(nxt)
+        count += 1
+    return [labels[(y + 1) * width + x + 1] for y in range(rows) for x in range(cols)], count
+
+
+def is_connected(walls: Grid, cols: int, rows: int) -> bool:
+    """True if all free cells of the grid form a single region."""
+    return label_regions(walls, cols, rows)[1] <= 1
+
+
+def fill_and_regrow(
+    walls: Grid,
+    cols: int,
+    rows: int,
+    root: int,
+    density: float,
+    rng: random.Random,
+    keep: Iterable[int] = ()
+) -> Grid:
+    """
+    Make the free space connected while keeping the wall density.
+
+    Every free pocket not reachable from `root` is filled in. If the grid
+    is now too sparse, random walls bordering the reachable region are
+    removed until the density is back at its target; a removed wall always
+    touches the region, so the free space stays connected throughout. If it
+    is too dense, leaves of a random spanning tree of the region are walled
+    off instead (see _prune_leaves). `root` and the `keep` cells stay free.
+    """
+    width = cols + 2
+    padded = _pad(walls, cols, rows)
+    start = (root // cols + 1) * width + root % cols + 1
+
+    reached = bytearray(len(padded))
+    reached[start] = 1
+    stack = [start]
+    while stack:
+        idx = stack.pop()
+        for nxt in (idx - 1, idx + 1, idx - width, idx + width):
+            if not padded[nxt] and not reached[nxt]:
+                reached[nxt] = 1
+                stack.append(nxt)
+
+    inner = _inner_mask(cols, rows)
+    free = 0
+    for idx in range(len(padded)):
+        if reached[idx]:
+            free += 1
+        elif inner[idx]:
+            padded[idx] = 1
+
+    # Regrow the region into random bordering walls
+    missing = (cols * rows - round(density * cols * rows)) - free
+    in_frontier = bytearray(len(padded))
+    frontier = []
+    for idx in range(len(padded)):
+        if reached[idx]:
+            for nxt in (idx - 1, idx + 1, idx - width, idx + width):
+                if padded[nxt] and inner[nxt] and not in_frontier[nxt]:
+                    in_frontier[nxt] = 1
+                    frontier.append(nxt)
+    while missing > 0 and frontier:
+        pick = rng.randrange(len(frontier))
+        frontier[pick], frontier[-1] = frontier[-1], frontier[pick]
+        idx = frontier.pop()
+        padded[idx] = 0
+        missing -= 1
+        for nxt in (idx - 1, idx + 1, idx - width, idx + width):
+            if padded[nxt] and inner[nxt] and not in_frontier[nxt]:
+                in_frontier[nxt] = 1
+                frontier.append(nxt)
+    if missing < 0:
+        protected = [start] + [(idx // cols + 1) * width + idx % cols + 1 for idx in keep]
+        _prune_leaves(padded, width, start, protected, -missing, rng)
+    return _unpad(padded, cols, rows)
+
+
+def carve_symmetric(walls: Grid, cols: int, rows: int, root: int) -> Grid:
+    """
+    Connect every free region to the one containing `root` by carving the
+    cheapest wall path to it, found with a single 0-1 BFS (entering a wall
+    costs 1, a free cell 0). Each carved cell is mirrored, so symmetric
+    layouts stay symmetric; the density drops by the carved walls.
+    """
+    width = cols + 2
+    padded = _pad(walls, cols, rows)
+    inner = _inner_mask(cols, rows)
+    start = (root // cols + 1) * width + root % cols + 1
+
+    reached = bytearray(len(padded))
+    cost = [-1] * len(padded)
+    parent = [-1] * len(padded)
+    cost[start] = 0
+    queue = deque([start])
+    while queue:
+        idx = queue.popleft()
+        if reached[idx]:
+            continue
+        reached[idx] = 1
+        for nxt in (idx - 1, idx + 1, idx - width, idx + width):
+            if not inner[nxt]:
+                continue
+            new_cost = cost[idx] + padded[nxt]
+            if cost[nxt] == -1 or new_cost < cost[nxt]:
+                cost[nxt] = new_cost
+                parent[nxt] = idx
+                if padded[nxt]:
+                    queue.append(nxt)
+                else:
+                    queue.appendleft(nxt)
+
+    # Walk back from every free cell outside the root region; cells of one
+    # region share a path, so each path is carved once
+    carved = bytearray(len(padded))
+    for idx in range(len(padded)):
+        if padded[idx] or cost[idx] <= 0 or carved[idx]:
+            continue
+        while cost[idx] > 0 and not carved[idx]:
+            carved[idx] = 1
+            if padded[idx]:
+                x, y = idx % width - 1, idx // width - 1
+                for mirror in _mirrors(x, y, cols, rows):
+                    padded[(mirror // cols + 1) * width + mirror % cols + 1] = 0
+            idx = parent[idx]
+    return _unpad(padded, cols, rows)
+
+
+def fill_symmetric(
+    walls: Grid,
+    cols: int,
+    rows: int,
+    keep: Iterable[int],
+    density: float,
+    rng: random.Random
+) -> Grid:
+    """
+    Add mirrored walls to a connected symmetric grid until the density is
+    reached. A cell only touches its own mirrors across the center lines, so
+    the free space is connected exactly when its top-left quadrant is and
+    reaches both center lines. Leaves of a spanning tree of the quadrant are
+    walled off (see _prune_leaves) together with their mirrors, keeping the
+    `keep` cells and one cell on each center line free.
+    """
+    half_cols, half_rows = (cols + 1) // 2, (rows + 1) // 2
+    width = half_cols + 2
+    quadrant = bytearray(half_cols * half_rows)
+    for y in range(half_rows):
+        quadrant[y * half_cols:(y + 1) * half_cols] = walls[y * cols:y * cols + half_cols]
+    missing = round(density * cols * rows) - sum(walls)
+    if missing <= 0 or quadrant.find(0) == -1:
+        return walls
+
+    # Quadrant cells (padded) to keep free: the kept cells' mirrors, or any
+    # free cell, then the free cell on each center line nearest to the first
+    reps = [
+        min(idx // cols, rows - 1 - idx // cols) * half_cols + min(idx % cols, cols - 1 - idx % cols)
+        for idx in keep
+    ] or [quadrant.find(0)]
+    rx, ry = reps[0] % half_cols, reps[0] // half_cols
+    right_edge = [y * half_cols + half_cols - 1 for y in range(half_rows)]
+    bottom_edge = range((half_rows - 1) * half_cols, half_rows * half_cols)
+    for edge in (right_edge, bottom_edge):
+        reps.append(min(
+            (idx for idx in edge if not quadrant[idx]),
+            key=lambda idx: abs(idx % half_cols - rx) + abs(idx // half_cols - ry)
+        ))
+    protected = [(idx // half_cols + 1) * width + idx % half_cols + 1 for idx in reps]
+
+    padded = _pad(quadrant, half_cols, half_rows)
+    weights = [0] * len(padded)
+    for y in range(half_rows):
+        for x in range(half_cols):
+            weights[(y + 1) * width + x + 1] = len(_mirrors(x, y, cols, rows))
+    _prune_leaves(padded, width, protected[0], protected, missing, rng, weights)
+
+    walls = bytearray(walls)
+    for y in range(half_rows):
+        for x in range(half_cols):
+            if padded[(y + 1) * width + x + 1]:
+                for mirror in _mirrors(x, y, cols, rows):
+                    walls[mirror] = 1
+    return walls
+
+
+def generate_grid(
+    layout: str,
+    density: float,
+    cols: int,
+    rows: int,
+    keep_clear: Iterable[int] = (),
+    rng: Optional[random.Random] = None
+) -> Grid:
+    """
+    Build a wall grid with the given layout and a connected free space.
+
+    Args:
+        layout: Name of a registered layout ("scatter", "maze", "rooms", "symmetric").
+        density: Target fraction of wall cells (clamped to 0..MAX_DENSITY).
+            Every layout reaches it to within a cell, except that symmetric
+            layouts with kept cells far from the center stay a little
+            sparser: the mirrors of those cells must stay connected.
+        cols, rows: Grid size in cells.
+        keep_clear: Cell indices that must stay free (e.g. the snake's start).
+        rng: Random generator, for reproducible levels.
+    """
+    rng = rng or random.Random()
+    density = min(max(density, 0.0), MAX_DENSITY)
+    symmetric = layout == "symmetric"
+    walls = LAYOUTS.get(layout, scatter_layout)(cols, rows, density, rng)
+
+    keep = list(keep_clear)
+    for idx in keep:
+        if symmetric:
+            for mirror in _mirrors(idx % cols, idx // cols, cols, rows):
+                walls[mirror] = 0
+        else:
+            walls[idx] = 0
+
+    if keep:
+        root = keep[0]
+    else:
+        root = walls.find(0)
+        if root == -1:
+            return walls
+
+    if symmetric:
+        walls = carve_symmetric(walls, cols, rows, root)
+        return fill_symmetric(walls, cols, rows, keep, density, rng)
+    return fill_and_regrow(walls, cols, rows, root, density, rng, keep)
+
+
+def generate_obstacles(
+    layout: str,
+    density: float,
+    keep_clear: Set[Cell],
+    rng: Optional[random.Random] = None
+) -> List[Cell]:
+    """
+    Generate obstacle cells (pixel coordinates) for the game board.
+
+    Args:
+        layout: Name of a registered layout.
+        density: Target fraction of the board covered by obstacles.
+        keep_clear: Board cells that must stay free.
+        rng: Random generator, for reproducible levels.
+    """
+    cols, rows = GAME_WIDTH // SNAKE_SIZE, GAME_HEIGHT // SNAKE_SIZE
+    keep = [(y // SNAKE_SIZE) * cols + x // SNAKE_SIZE for (x, y) in keep_clear]
+    walls = generate_grid(layout, density, cols, rows, keep, rng)
+    return [
+        ((idx % cols) * SNAKE_SIZE, (idx // cols) * SNAKE_SIZE)
+        for idx in range(cols * rows) if walls[idx]
+    ]
+
+
+# ----------------------------------------------------------------
+#                           HELPERS
+# ----------------------------------------------------------------
+
+def _pad(walls: Grid, cols: int, rows: int) -> Grid:
+    """Copy of the grid surrounded by a one-cell wall border."""
+    width = cols + 2
+    padded = bytearray(b"\x01" * (width * (rows + 2)))
+    for y in range(rows):
+        start = (y + 1) * width + 1
+        padded[start:start + cols] = walls[y * cols:(y + 1) * cols]
+    return padded
+
+
+def _unpad(padded: Grid, cols: int, rows: int) -> Grid:
+    """Inverse of _pad."""
+    width = cols + 2
+    walls = bytearray(cols * rows)
+    for y in range(rows):
+        start = (y + 1) * width + 1
+        walls[y * cols:(y + 1) * cols] = padded[start:start + cols]
+    return walls
+
+
+def _room_lines(cols: int, rows: int, spacing: int) -> Grid:
+    """Grid of horizontal and vertical wall lines every `spacing` cells."""
+    walls = bytearray(cols * rows)
+    for y in range(rows):
+        for x in range(cols):
+            if x % spacing == spacing - 1 or y % spacing == spacing - 1:
+                walls[y * cols + x] = 1
+    return walls
+
+
+def _inner_mask(cols: int, rows: int) -> Grid:
+    """Padded-grid mask that is 1 for board cells and 0 for the border."""
+    inner = bytearray(_pad(bytearray(cols * rows), cols, rows))
+    for idx in range(len(inner)):
+        inner[idx] ^= 1
+    return inner
+
+
+def _mirrors(x: int, y: int, cols: int, rows: int) -> Set[int]:
+    """Indices of a cell and its horizontal, vertical and diagonal mirrors."""
+    mx, my = cols - 1 - x, rows - 1 - y
+    return {y * cols + x, y * cols + mx, my * cols + x, my * cols + mx}
+
+
+def _thin_out(walls: Grid, density: float, rng: random.Random) -> None:
+    """Remove random walls until at most `density` of the cells are walls."""
+    target = round(density * len(walls))
+    wall_cells = [idx for idx in range(len(walls)) if walls[idx]]
+    excess = len(wall_cells) - target
+    if excess > 0:
+        for idx in rng.sample(wall_cells, excess):
+            walls[idx] = 0
+
+
+def _prune_leaves(
+    padded: Grid,
+    width: int,
+    root: int,
+    protected: Iterable[int],
+    count: int,
+    rng: random.Random,
+    weights: Optional[List[int]] = None
+) -> None:
+    """
+    Wall off `count` cells of the free region around `root` (in a padded
+    grid) without splitting it: grow a random spanning tree of the region,
+    then wall random leaves; a parent becomes a leaf once its last child is
+    walled. The protected cells, and so their paths to `root`, stay free.
+    `weights` gives the number of cells walling a tree cell stands for
+    (default 1); leaves heavier than what is left to wall are skipped.
+    """
+    parent = [-1] * len(padded)
+    children = [0] * len(padded)
+    seen = bytearray(len(padded))
+    seen[root] = 1
+    frontier = [root]
+    tree = []
+    while frontier:
+        pick = rng.randrange(len(frontier))
+        frontier[pick], frontier[-1] = frontier[-1], frontier[pick]
+        idx = frontier.pop()
+        tree.append(idx)
+        for nxt in (idx - 1, idx + 1, idx - width, idx + width):
+            if not padded[nxt] and not seen[nxt]:
+                seen[nxt] = 1
+                parent[nxt] = idx
+                children[idx] += 1
+                frontier.append(nxt)
+
+    fixed = bytearray(len(padded))
+    for idx in protected:
+        fixed[idx] = 1
+    leaves = [idx for idx in tree if not children[idx] and not fixed[idx]]
+    while count > 0 and leaves:
+        pick = rng.randrange(len(leaves))
+        leaves[pick], leaves[-1] = leaves[-1], leaves[pick]
+        idx = leaves.pop()
+        weight = weights[idx] if weights else 1
+        if weight > count:
+            continue
+        padded[idx] = 1
+        count -= weight
+        up = parent[idx]
+        children[up] -= 1
+        if not children[up] and not fixed[up]:
+            leaves.append(up)
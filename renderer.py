@@ -0,0 +1,204 @@
+"""
+Raster renderer for the Snake game.
+
+Instead of one canvas item per snake segment, food item and obstacle, the
+board is painted into a single tk.PhotoImage. Sprite tiles (square, circle,
+food, bonus, obstacle, background) are pre-rendered once; each tick only the
+cells that changed (new head, vacated tail, food and bonus food) are blitted.
+The canvas item count stays at one however long the snake grows.
+"""
+import tkinter as tk
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple
+
+from constants import (
+    GAME_WIDTH, GAME_HEIGHT, SNAKE_SIZE,
+    FOOD_COLOR, BONUS_FOOD_COLOR, OBSTACLE_COLOR
+)
+
+if TYPE_CHECKING:
+    from engine import SnakeEngine
+
+Cell = Tuple[int, int]
+
+OUTLINE_COLOR = "black"  # matches the default outline of canvas shapes
+
+
+class RasterRenderer:
+    """
+    Draws the board into one PhotoImage with dirty-cell updates.
+    """
+
+    def __init__(
+        self,
+        canvas: tk.Canvas,
+        snake_color: str,
+        bg_color: str,
+        snake_shape: str = "square",
+        zoom: int = 1
+    ) -> None:
+        """
+        Pre-renders the sprite tiles for the given colors and shape.
+
+        Args:
+            canvas: The game canvas the board image is shown on.
+            snake_color: The color of the snake segments.
+            bg_color: The board background color.
+            snake_shape: Shape of the snake segments ("square" or "circle").
+            zoom: Pixel scale of the sprites. Tiles are rasterized at
+                SNAKE_SIZE // zoom pixels and scaled up by `zoom`, so
+                zoom=SNAKE_SIZE paints the board at one pixel per cell.
+        """
+        self.canvas = canvas
+        self.bg_color = bg_color
+        if zoom < 1 or SNAKE_SIZE % zoom:
+            zoom = 1
+        self.zoom = zoom
+
+        snake_sprite = "circle" if snake_shape == "circle" else "square"
+        self.sprites: Dict[str, str] = {
+            "bg": self._tile(bg_color, bg_color, "square", outline=False),
+            "snake": self._tile(snake_color, bg_color, snake_sprite),
+            "food": self._tile(FOOD_COLOR, bg_color, "square"),
+            "bonus": self._tile(BONUS_FOOD_COLOR, bg_color, "circle"),
+            "obstacle": self._tile(OBSTACLE_COLOR, bg_color, "square"),
+        }
+
+        self.image = tk.PhotoImage(width=GAME_WIDTH, height=GAME_HEIGHT)
+        self.drawn: Dict[Cell, str] = {}  # sprite currently shown per non-bg cell
+        self.obstacles: Set[Cell] = set()
+        self.snake_cells: Dict[Cell, int] = {}  # snake cell -> segments on it
+        self.prev_head: Optional[Cell] = None
+        self.prev_length = 0
+        self.prev_tail: Optional[Cell] = None
+        self.prev_food: Optional[Cell] = None
+        self.prev_bonus: Optional[Cell] = None
+
+    # ----------------------------------------------------------------
+    #                        SPRITE TILES
+    # ----------------------------------------------------------------
+
+    def _tile(self, fill: str, bg_color: str, shape: str, outline: bool = True) -> str:
+        """
+        Rasterize one SNAKE_SIZE x SNAKE_SIZE sprite as PhotoImage.put data.
+        """
+        fill_hex = self._hex(fill)
+        bg_hex = self._hex(bg_color)
+        outline_hex = self._hex(OUTLINE_COLOR) if outline else fill_hex
+
+        size = SNAKE_SIZE // self.zoom
+        radius = size / 2
+        rows = []
+        for py in range(size):
+            row = []
+            for px in range(size):
+                if shape == "circle":
+                    dist = ((px + 0.5 - radius) ** 2 + (py + 0.5 - radius) ** 2) ** 0.5
+                    if dist > radius:
+                        color = bg_hex
+                    elif dist > radius - 1 and size > 3:
+                        color = outline_hex
+                    else:
+                        color = fill_hex
+                elif size > 3 and (px in (0, size - 1) or py in (0, size - 1)):
+                    color = outline_hex
+                else:
+                    color = fill_hex
+                row.extend([color] * self.zoom)
+            line = "{" + " ".join(row) + "}"
+            rows.extend([line] * self.zoom)
+        return " ".join(rows)
+
+    def _hex(self, color: str) -> str:
+        """Resolve a Tk color name to #rrggbb."""
+        r, g, b = self.canvas.winfo_rgb(color)
+        return f"#{r >> 8:02x}{g >> 8:02x}{b >> 8:02x}"
+
+    # ----------------------------------------------------------------
+    #                          DRAWING
+    # ----------------------------------------------------------------
+
+    def reset(self, engine: "SnakeEngine") -> None:
+        """
+        Repaint the whole board, e.g. at the start of a round.
+        Recreates the canvas image item if the canvas was cleared.
+        """
+        self.canvas.delete("board")
+        self.canvas.create_image(0, 0, image=self.image, anchor=tk.NW, tag="board")
+        self.canvas.tag_lower("board")
+
+        self.image.put(self._hex(self.bg_color), to=(0, 0, GAME_WIDTH, GAME_HEIGHT))
+        self.drawn.clear()
+        self.obstacles = set(engine.obstacles)
+        self.snake_cells = {}
+        for cell in engine.snake_body:
+            self.snake_cells[cell] = self.snake_cells.get(cell, 0) + 1
+        for cell in self.obstacles:
+            self._blit(cell, "obstacle")
+        for cell in engine.snake_body:
+            self._blit(cell, self._sprite_at(cell, engine))
+        self._blit(engine.food_position, self._sprite_at(engine.food_position, engine))
+        if engine.bonus_food_active and engine.bonus_food_position:
+            self._blit(engine.bonus_food_position, "bonus")
+        self._remember(engine)
+
+    def draw(self, engine: "SnakeEngine") -> None:
+        """
+        Update only the cells that may have changed since the last draw:
+        the new head, the vacated tail, and old/new food and bonus food.
+        """
+        self._track_snake(engine)
+        bonus = engine.bonus_food_position if engine.bonus_food_active else None
+        for cell in (engine.snake_body[0], self.prev_tail, self.prev_food,
+                     engine.food_position, self.prev_bonus, bonus):
+            if cell is None:
+                continue
+            sprite = self._sprite_at(cell, engine)
+            if self.drawn.get(cell, "bg") != sprite:
+                self._blit(cell, sprite)
+        self._remember(engine)
+
+    def _sprite_at(self, cell: Cell, engine: "SnakeEngine") -> str:
+        """
+        Sprite for a cell, in the canvas stacking order
+        (obstacles over bonus food over food over the snake).
+        """
+        if cell in self.obstacles:
+            return "obstacle"
+        if engine.bonus_food_active and cell == engine.bonus_food_position:
+            return "bonus"
+        if cell == engine.food_position:
+            return "food"
+        if cell in self.snake_cells:
+            return "snake"
+        return "bg"
+
+    def _track_snake(self, engine: "SnakeEngine") -> None:
+        """
+        Follow the snake's move since the last draw: count the new head in,
+        and the old tail out unless the snake grew. Cells are counted
+        because a ghost snake can cover a cell twice.
+        """
+        head = engine.snake_body[0]
+        if head == self.prev_head:
+            return  # the round ended without a move
+        self.snake_cells[head] = self.snake_cells.get(head, 0) + 1
+        if len(engine.snake_body) == self.prev_length:
+            left = self.snake_cells.pop(self.prev_tail) - 1
+            if left:
+                self.snake_cells[self.prev_tail] = left
+
+    def _blit(self, cell: Cell, sprite: str) -> None:
+        """Copy a pre-rendered sprite tile into the board image."""
+        self.image.put(self.sprites[sprite], to=cell)
+        if sprite == "bg":
+            self.drawn.pop(cell, None)
+        else:
+            self.drawn[cell] = sprite
+
+    def _remember(self, engine: "SnakeEngine") -> None:
+        """Store the cells that the next draw has to re-check."""
+        self.prev_head = engine.snake_body[0]
+        self.prev_length = len(engine.snake_body)
+        self.prev_tail = engine.snake_body[-1]
+        self.prev_food = engine.food_position
+        self.prev_bonus = engine.bonus_food_position if engine.bonus_food_active else None
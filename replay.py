@@ -0,0 +1,121 @@
+"""
+Recorded games (replays) for the Snake game.
+
+A replay is a plain JSON dict holding everything needed to re-simulate a
+round headlessly: the round seed, the game settings and the input log of
+(tick, direction) changes, plus the appearance settings and final score.
+"""
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from constants import REPLAYS_DIR
+from engine import SnakeEngine
+
+REPLAY_VERSION = 1
+
+
+def record_replay(
+    engine: SnakeEngine,
+    player_name: str = "Player",
+    snake_color: str = "#00ff00",
+    bg_color: str = "#000000",
+    snake_shape: str = "square"
+) -> Dict[str, Any]:
+    """
+    Build the replay dict of the engine's current round.
+
+    Args:
+        engine: The engine whose round was just played.
+        player_name: The player's displayed name.
+        snake_color: The snake color, ideally as "#rrggbb".
+        bg_color: The background color, ideally as "#rrggbb".
+        snake_shape: Shape of the snake segments ("square" or "circle").
+    """
+    return {
+        "version": REPLAY_VERSION,
+        "seed": engine.seed,
+        "game_mode": engine.game_mode,
+        "difficulty": engine.difficulty,
+        "time_limit": engine.time_limit,
+        "inputs": [[tick, direction] for tick, direction in engine.inputs],
+        "ticks": engine.ticks,
+        "score": engine.score,
+        "player": player_name,
+        "snake_color": snake_color,
+        "bg_color": bg_color,
+        "snake_shape": snake_shape
+    }
+
+
+def play_back(replay: Dict[str, Any], max_ticks: Optional[int] = None) -> Iterator[SnakeEngine]:
+    """
+    Re-simulate a replay headlessly.
+
+    Yields the same engine object after the round starts and after every
+    tick, until the round ends or `max_ticks` (default: the recorded tick
+    count) is reached. Callers must copy any state they want to keep.
+    """
+    engine = SnakeEngine(
+        replay["game_mode"],
+        replay["difficulty"],
+        time_limit=replay.get("time_limit"),
+        seed=replay["seed"]
+    )
+    inputs = {tick: direction for tick, direction in replay["inputs"]}
+    limit = replay.get("ticks", 0) if max_ticks is None else max_ticks
+
+    yield engine
+    while engine.ticks < limit:
+        direction = inputs.get(engine.ticks)
+        if direction is not None:
+            engine.direction = direction
+        alive = engine.step()
+        yield engine
+        if not alive:
+            return
+
+
+def replay_score(replay: Dict[str, Any]) -> int:
+    """Re-simulate a replay and return the score it actually reaches."""
+    engine = None
+    for engine in play_back(replay):
+        pass
+    return engine.score if engine else 0
+
+
+def save_replay(replay: Dict[str, Any], directory: str = REPLAYS_DIR) -> str:
+    """
+    Write a replay into `directory` and return the file path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = f"{int(time.time() * 1000)}_{replay['seed']}.json"
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(replay, f)
+    return path
+
+
+def delete_replay(path: Any, directory: str = REPLAYS_DIR) -> bool:
+    """
+    Delete a replay file written by save_replay. Paths outside `directory`
+    are ignored: they come from the editable high-score file.
+
+    Returns:
+        True if a file was deleted.
+    """
+    if not isinstance(path, str):
+        return False
+    root = os.path.realpath(directory)
+    target = os.path.realpath(path)
+    if target == root or os.path.commonpath([root, target]) != root or not os.path.isfile(target):
+        return False
+    os.remove(target)
+    return True
+
+
+def load_replay(path: str) -> Dict[str, Any]:
+    """Read a replay file written by save_replay."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,155 @@
+"""
+Game-mode rules for the Snake game.
+
+Every game mode is a GameRule subclass registered under its mode key.
+At the start of each round the engine lets the active rule set up the board
+(e.g. place obstacles) and then compile a transition table: for every cell
+and direction it holds the next cell, or WALL if that move kills the snake.
+Moving the head is then a single table lookup, so new modes can be added
+here without touching the game loop.
+"""
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple, Type
+
+from constants import GAME_WIDTH, GAME_HEIGHT, SNAKE_SIZE, NUM_OBSTACLES
+
+if TYPE_CHECKING:
+    from engine import SnakeEngine
+
+Cell = Tuple[int, int]
+TransitionTable = Dict[str, Dict[Cell, Optional[Cell]]]
+
+# Sentinel stored in a transition table for a move into a wall or obstacle
+WALL: Optional[Cell] = None
+
+DIRECTION_DELTAS: Dict[str, Cell] = {
+    "left": (-SNAKE_SIZE, 0),
+    "right": (SNAKE_SIZE, 0),
+    "up": (0, -SNAKE_SIZE),
+    "down": (0, SNAKE_SIZE)
+}
+
+# Registered rules, keyed by game mode ("classic", "portal", ...)
+GAME_RULES: Dict[str, Type["GameRule"]] = {}
+
+
+def register_rule(rule_class: Type["GameRule"]) -> Type["GameRule"]:
+    """
+    Class decorator that registers a GameRule subclass under its `name`.
+    """
+    GAME_RULES[rule_class.name] = rule_class
+    return rule_class
+
+
+def get_rule(game_mode: str) -> "GameRule":
+    """
+    Return a new rule instance for the given game mode,
+    falling back to classic for unknown modes.
+    """
+    return GAME_RULES.get(game_mode, GAME_RULES["classic"])()
+
+
+class GameRule:
+    """
+    Base class for game modes. Subclasses override the class attributes
+    and hooks they need, then register themselves with @register_rule.
+    """
+
+    name = ""
+    wrap_edges = False      # True: leaving one edge enters the opposite one
+    self_collision = True   # False: the snake may pass through itself
+
+    def setup(self, engine: "SnakeEngine") -> None:
+        """
+        Prepare the board at the start of a round (before food is placed).
+        """
+
+    def compile_transitions(self, cells: Set[Cell], blocked: Set[Cell]) -> TransitionTable:
+        """
+        Build the next-cell lookup table for this round.
+
+        Args:
+            cells: All valid cells of the board.
+            blocked: Cells that kill the snake on entry (e.g. obstacles).
+
+        Returns:
+            {direction: {cell: next_cell or WALL}}
+        """
+        table: TransitionTable = {}
+        for direction, (dx, dy) in DIRECTION_DELTAS.items():
+            moves: Dict[Cell, Optional[Cell]] = {}
+            for (x, y) in cells:
+                nx, ny = x + dx, y + dy
+                if self.wrap_edges:
+                    nx %= GAME_WIDTH
+                    ny %= GAME_HEIGHT
+                elif nx < 0 or nx >= GAME_WIDTH or ny < 0 or ny >= GAME_HEIGHT:
+                    moves[(x, y)] = WALL
+                    continue
+                moves[(x, y)] = WALL if (nx, ny) in blocked else (nx, ny)
+            table[direction] = moves
+        return table
+
+
+@register_rule
+class ClassicRule(GameRule):
+    """Standard gameplay: walls and the snake's own body are deadly."""
+
+    name = "classic"
+
+
+@register_rule
+class PortalRule(GameRule):
+    """The snake wraps around the board edges."""
+
+    name = "portal"
+    wrap_edges = True
+
+
+@register_rule
+class ObstaclesRule(GameRule):
+    """
+    Classic rules plus generated obstacles. Subclasses can pick another
+    level layout ("maze", "rooms", "symmetric") and density.
+    """
+
+    name = "obstacles"
+    layout = "scatter"
+    density = NUM_OBSTACLES / ((GAME_WIDTH // SNAKE_SIZE) * (GAME_HEIGHT // SNAKE_SIZE))
+
+    def setup(self, engine: "SnakeEngine") -> None:
+        engine.create_obstacles(self.layout, self.density)
+
+
+@register_rule
+class GhostRule(GameRule):
+    """Walls are deadly, but the snake can pass through itself."""
+
+    name = "ghost"
+    self_collision = False
+
+
+@register_rule
+class MazeRule(ObstaclesRule):
+    """Obstacles laid out as a thinned-out maze: corridors with loops."""
+
+    name = "maze"
+    layout = "maze"
+    density = 0.3
+
+
+@register_rule
+class RoomsRule(ObstaclesRule):
+    """Obstacles laid out as rooms joined by single doors."""
+
+    name = "rooms"
+    layout = "rooms"
+    density = 0.3
+
+
+@register_rule
+class SymmetricRule(ObstaclesRule):
+    """Random obstacles mirrored into all four quarters of the board."""
+
+    name = "symmetric"
+    layout = "symmetric"
+    density = 0.2
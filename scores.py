@@ -0,0 +1,160 @@
+"""
+High-score persistence (highscores.json), usable without Tk.
+
+LeaderboardCache keeps one parsed copy of a high-score file per process.
+refresh() only re-reads the file when its mtime, size or inode changed, and
+every subscriber (e.g. each open game window) is told about new entries.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from constants import HIGH_SCORES_JSON
+
+
+def load_high_scores(path: str = HIGH_SCORES_JSON) -> List[Dict[str, Any]]:
+    """
+    Load multiple scores from the JSON file, if it exists,
+    returning a list of dicts: [{"player": str, "score": int}, ...].
+    Sorted descending by "score".
+    """
+    if not os.path.exists(path):
+        return []
+
+    try:
+        return read_high_scores(path)
+    except (OSError, ValueError):
+        return []
+
+
+def read_high_scores(path: str = HIGH_SCORES_JSON) -> List[Dict[str, Any]]:
+    """
+    Like load_high_scores, but a missing, unreadable or malformed file
+    raises instead of reading as an empty leaderboard.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If it is not a JSON list of entries with a string
+            "player" and an integer "score".
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list) or not all(_is_entry(d) for d in data):
+        raise ValueError(f"{path} is not a list of high-score entries")
+
+    # Sort by score descending
+    data.sort(key=lambda d: d["score"], reverse=True)
+    return data
+
+
+def _is_entry(entry: Any) -> bool:
+    """True for {"player": str, "score": int, ...} (bools are not scores)."""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("player"), str)
+        and isinstance(entry.get("score"), int)
+        and not isinstance(entry["score"], bool)
+    )
+
+
+def save_high_scores(data: List[Dict[str, Any]], path: str = HIGH_SCORES_JSON) -> None:
+    """
+    Persists the updated list of {player, score} dicts into the JSON file.
+    The file is written under a temporary name and then swapped in, so
+    readers never see a half-written file.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class LeaderboardCache:
+    """
+    Shared, lazily parsed view of one high-score file.
+    """
+
+    def __init__(self, path: str = HIGH_SCORES_JSON) -> None:
+        self.path = path
+        self.entries: List[Dict[str, Any]] = []  # sorted, treat as read-only
+        self.signature: Optional[Tuple[int, int, int]] = None
+        self.loaded = False
+        self.subscribers: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self.watching = False  # set by whoever polls refresh()
+
+    def get(self) -> List[Dict[str, Any]]:
+        """The current entries, parsing the file on first use."""
+        if not self.loaded:
+            self.refresh()
+        return self.entries
+
+    def refresh(self) -> bool:
+        """
+        Cheap change check: stat the file and re-parse it only if it
+        changed since it was last read or written through this cache.
+        A file that cannot be parsed counts as no change: the old entries
+        are kept and the next refresh tries again.
+
+        Returns:
+            True if the entries changed (subscribers have been notified).
+        """
+        signature = self._stat()
+        if self.loaded and signature == self.signature:
+            return False
+        entries = []
+        if signature is not None:
+            try:
+                entries = read_high_scores(self.path)
+            except (OSError, ValueError):
+                return False
+        self.signature = signature
+        self.loaded = True
+        if entries == self.entries:
+            return False
+        self.entries = entries
+        self.notify()
+        return True
+
+    def save(self, data: List[Dict[str, Any]]) -> None:
+        """Write the entries to the file and notify subscribers."""
+        self.write(data)
+        self.notify()
+
+    def write(self, data: List[Dict[str, Any]]) -> None:
+        """Write the entries to the file and cache them, without notifying."""
+        save_high_scores(data, self.path)
+        self.entries = sorted(data, key=lambda d: d["score"], reverse=True)
+        self.signature = self._stat()
+        self.loaded = True
+
+    def subscribe(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """Call callback(entries) whenever the entries change."""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def notify(self) -> None:
+        """Call every subscriber with the current entries."""
+        for callback in list(self.subscribers):
+            callback(self.entries)
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        """(mtime_ns, size, inode) of the file, or None if it is missing."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+_leaderboards: Dict[str, LeaderboardCache] = {}  # process-wide, by absolute path
+
+
+def get_leaderboard(path: str = HIGH_SCORES_JSON) -> LeaderboardCache:
+    """The process-wide LeaderboardCache of a high-score file."""
+    key = os.path.abspath(path)
+    if key not in _leaderboards:
+        _leaderboards[key] = LeaderboardCache(path)
+    return _leaderboards[key]
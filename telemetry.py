@@ -0,0 +1,417 @@
+"""
+Operational telemetry for unattended game kiosks.
+
+The game records into cheap in-process counters and histograms (a lock and
+a bisect per observation). An optional TelemetryExporter thread periodically
+writes them, away from the game loop, to:
+
+    <dir>/metrics.prom      OpenMetrics text, replaced atomically
+    <dir>/events.jsonl      JSON-lines event log (game overs and periodic
+                            metric snapshots), rotated by size
+
+Collected: ticks and tick lag (tick-rate health), frame times, game-over
+causes by mode and difficulty, session lengths, save_high_scores latency
+and process memory.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+DEFAULT_INTERVAL = 15.0             # seconds between exports
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024  # size of one event log file
+DEFAULT_BACKUPS = 3                 # rotated event logs kept
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class Metric:
+    """
+    Base class: a named metric with optional labels and its own lock.
+    """
+
+    kind = "unknown"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def _label_text(self, labels: Labels, extra: str = "") -> str:
+        """Render {name="value",...} for a sample line."""
+        pairs = [f'{key}="{_escape(value)}"' for key, value in zip(self.labelnames, labels)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def total(self) -> float:
+        with self.lock:
+            return sum(self.values.values())
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            items = list(self.values.items())
+        return [f"{self.name}_total{self._label_text(labels)} {_number(value)}" for labels, value in items]
+
+    def snapshot(self) -> Any:
+        with self.lock:
+            return {",".join(labels) or "all": value for labels, value in self.values.items()}
+
+
+class Gauge(Metric):
+    """A value that can go up and down, per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        with self.lock:
+            self.values[labels] = value
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            items = list(self.values.items())
+        return [f"{self.name}{self._label_text(labels)} {_number(value)}" for labels, value in items]
+
+    def snapshot(self) -> Any:
+        with self.lock:
+            return {",".join(labels) or "all": value for labels, value in self.values.items()}
+
+
+class Histogram(Metric):
+    """
+    Observations counted into fixed buckets, per label set.
+    Percentiles are estimated from the buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = sorted(buckets)
+        # labels -> [per-bucket counts (+Inf last), count, sum]
+        self.values: Dict[Labels, List[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+            entry[0][index] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of a `with` block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def percentile(self, q: float, *labels: str) -> Optional[float]:
+        """
+        Estimate the q-quantile (0..1) by interpolating inside its bucket.
+        Returns None without observations.
+        """
+        with self.lock:
+            entry = self.values.get(labels)
+            if entry is None or entry[1] == 0:
+                return None
+            counts, count = list(entry[0]), entry[1]
+        rank, seen = q * count, 0
+        for idx, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if idx == len(self.buckets):
+                    return self.buckets[-1]  # beyond the last bound
+                lower = self.buckets[idx - 1] if idx else 0.0
+                return lower + (self.buckets[idx] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            items = [(labels, list(entry[0]), entry[1], entry[2]) for labels, entry in self.values.items()]
+        lines = []
+        for labels, counts, count, total in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + [float("inf")], counts):
+                cumulative += bucket_count
+                le = 'le="{}"'.format("+Inf" if bound == float("inf") else _number(bound))
+                lines.append(f"{self.name}_bucket{self._label_text(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_count{self._label_text(labels)} {count}")
+            lines.append(f"{self.name}_sum{self._label_text(labels)} {_number(total)}")
+        return lines
+
+    def snapshot(self) -> Any:
+        with self.lock:
+            keys = [(labels, entry[1], entry[2]) for labels, entry in self.values.items()]
+        result = {}
+        for labels, count, total in keys:
+            stats = {"count": count, "mean": total / count if count else None}
+            for q in PERCENTILES:
+                stats[f"p{round(q * 100)}"] = self.percentile(q, *labels)
+            result[",".join(labels) or "all"] = stats
+        return result
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the OpenMetrics text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Format a sample value without a needless ".0"."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Registry:
+    """
+    The set of metrics one process exports.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """The registry in the OpenMetrics text format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.extend(metric.samples())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as a JSON-friendly dict."""
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+
+# ----------------------------------------------------------------
+#                        GAME METRICS
+# ----------------------------------------------------------------
+
+REGISTRY = Registry()
+
+TICKS = REGISTRY.register(Counter(
+    "snake_ticks", "Game ticks played.", ["mode"]
+))
+TICK_LAG = REGISTRY.register(Histogram(
+    "snake_tick_lag_seconds", "How much later than scheduled a tick ran.",
+    [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0]
+))
+FRAME_TIME = REGISTRY.register(Histogram(
+    "snake_frame_seconds", "Time to advance the engine and redraw one tick.",
+    [0.0005, 0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.05, 0.1, 0.25]
+))
+GAME_OVERS = REGISTRY.register(Counter(
+    "snake_game_overs", "Rounds that ended, by cause (wall, obstacle, self, time).",
+    ["mode", "difficulty", "cause"]
+))
+SESSION_LENGTH = REGISTRY.register(Histogram(
+    "snake_session_seconds", "Wall-clock length of a round.",
+    [10, 30, 60, 120, 300, 600, 1200, 1800, 3600], ["mode"]
+))
+SAVE_LATENCY = REGISTRY.register(Histogram(
+    "snake_save_high_scores_seconds", "Time to write the high-score file.",
+    [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0]
+))
+MEMORY = REGISTRY.register(Gauge(
+    "snake_process_resident_bytes", "Resident memory of the game process."
+))
+
+_events: deque = deque(maxlen=10000)  # events waiting for the exporter
+
+
+def record_tick(mode: str, frame_seconds: float, lag_seconds: Optional[float]) -> None:
+    """Record one tick of the game loop."""
+    TICKS.inc(mode)
+    FRAME_TIME.observe(frame_seconds)
+    if lag_seconds is not None:
+        TICK_LAG.observe(max(0.0, lag_seconds))
+
+
+def record_game_over(
+    mode: str,
+    difficulty: str,
+    cause: Optional[str],
+    session_seconds: float,
+    score: int,
+    ticks: int
+) -> None:
+    """Record the end of a round and queue a game_over event."""
+    cause = cause or "unknown"
+    GAME_OVERS.inc(mode, difficulty, cause)
+    SESSION_LENGTH.observe(session_seconds, mode)
+    _events.append({
+        "event": "game_over", "time": time.time(), "mode": mode, "difficulty": difficulty,
+        "cause": cause, "session_seconds": round(session_seconds, 3), "score": score, "ticks": ticks
+    })
+
+
+def resident_memory() -> Optional[int]:
+    """
+    Resident memory of this process in bytes (current on Linux, peak
+    elsewhere on Unix), or None where it cannot be read.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ----------------------------------------------------------------
+#                        EXPORTER
+# ----------------------------------------------------------------
+
+class TelemetryExporter:
+    """
+    Background thread that writes the registry and queued events to disk
+    every `interval` seconds (and once more when stopped).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        interval: float = DEFAULT_INTERVAL,
+        registry: Registry = REGISTRY,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS
+    ) -> None:
+        """
+        Args:
+            directory: Where metrics.prom and events.jsonl are written.
+            interval: Seconds between exports.
+            registry: The metrics to export.
+            max_bytes: Size at which the event log is rotated.
+            backups: Rotated event logs kept (events.jsonl.1, .2, ...).
+
+        Raises:
+            ValueError: If `interval` is not a positive, finite number.
+        """
+        if not 0 < interval < float("inf"):
+            raise ValueError(f"telemetry interval must be a positive number of seconds, got {interval}")
+        self.directory = directory
+        self.interval = interval
+        self.registry = registry
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.metrics_path = os.path.join(directory, "metrics.prom")
+        self.events_path = os.path.join(directory, "events.jsonl")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_ticks = 0.0
+        self._last_time = time.monotonic()
+
+    def start(self) -> "TelemetryExporter":
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the thread after a final export."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._export_safely()
+        self._export_safely()
+
+    def _export_safely(self) -> None:
+        """Export, but never let a full or read-only disk stop the thread."""
+        try:
+            self.export()
+        except OSError as exc:
+            print(f"Telemetry export failed: {exc}", file=sys.stderr)
+
+    def export(self) -> None:
+        """Write the metrics file and append pending events and a snapshot."""
+        memory = resident_memory()
+        if memory is not None:
+            MEMORY.set(memory)
+
+        tmp_path = self.metrics_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.registry.render())
+        os.replace(tmp_path, self.metrics_path)
+
+        now = time.monotonic()
+        ticks = TICKS.total()
+        elapsed = now - self._last_time
+        tick_rate = (ticks - self._last_ticks) / elapsed if elapsed > 0 else 0.0
+        self._last_ticks, self._last_time = ticks, now
+
+        lines = []
+        while _events:
+            lines.append(json.dumps(_events.popleft()))
+        lines.append(json.dumps({
+            "event": "metrics", "time": time.time(),
+            "tick_rate": round(tick_rate, 2), "metrics": self.registry.snapshot()
+        }))
+        self._append_events(lines)
+
+    def _append_events(self, lines: List[str]) -> None:
+        """Append JSON lines to the event log, rotating it when it is full."""
+        try:
+            size = os.path.getsize(self.events_path)
+        except OSError:
+            size = 0
+        if size and size + sum(len(line) + 1 for line in lines) > self.max_bytes:
+            for idx in range(self.backups - 1, 0, -1):
+                older = f"{self.events_path}.{idx}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.events_path}.{idx + 1}")
+            if self.backups > 0:
+                os.replace(self.events_path, f"{self.events_path}.1")
+            else:
+                os.remove(self.events_path)
+        with open(self.events_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
@@ -0,0 +1,206 @@
+"""
+Tick-indexed timer wheel for game events.
+
+Time in the wheel is game time: the engine advances it by the length of each
+tick, so nothing moves while the game is paused. Scheduling and cancelling
+an event are O(1); advancing only visits the slots that were passed.
+
+With journaling enabled, every change to a timer is logged so the wheel can
+be rolled back to an earlier mark (used by the engine's undo).
+"""
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Timer:
+    """
+    Handle for a scheduled event, returned by TimerWheel.schedule.
+    """
+
+    __slots__ = ("timer_id", "deadline", "slot", "callback", "interval", "active")
+
+    def __init__(
+        self,
+        timer_id: int,
+        deadline: int,
+        slot: int,
+        callback: Callable[[], None],
+        interval: Optional[int]
+    ) -> None:
+        self.timer_id = timer_id
+        self.deadline = deadline    # absolute wheel tick at which the event fires
+        self.slot = slot
+        self.callback = callback
+        self.interval = interval    # ticks between repeats, None for one-shot events
+        self.active = True
+
+    def copy(self, callback: Callable[[], None]) -> "Timer":
+        """A copy of this timer that calls `callback` instead."""
+        timer = Timer(self.timer_id, self.deadline, self.slot, callback, self.interval)
+        timer.active = self.active
+        return timer
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel. Events are stored in the slot of their deadline tick;
+    events further away than one rotation simply wait for their deadline.
+    Only non-empty slots are kept, so copying the wheel costs one entry
+    per pending timer rather than one per slot.
+    """
+
+    def __init__(self, resolution: int = 10, size: int = 512) -> None:
+        """
+        Args:
+            resolution: Milliseconds of game time per wheel tick.
+            size: Number of slots in the wheel.
+        """
+        self.resolution = resolution
+        self.size = size
+        self.slots: Dict[int, Dict[int, Timer]] = {}   # slot index -> pending timers
+        self.current_tick = 0
+        self._pending_ms = 0
+        self._next_id = 0
+        # (timer, deadline, slot, active, was in its slot) before each change; None = off
+        self.journal: Optional[List[Tuple[Timer, int, int, bool, bool]]] = None
+
+    def schedule(
+        self,
+        delay_ms: int,
+        callback: Callable[[], None],
+        repeat: bool = False
+    ) -> Timer:
+        """
+        Run `callback` after `delay_ms` milliseconds of game time.
+
+        Args:
+            delay_ms: Delay before the event fires (at least one wheel tick).
+            callback: Function called with no arguments when the event fires.
+            repeat: If True, the event fires again every `delay_ms`.
+
+        Returns:
+            A Timer handle that can be passed to cancel().
+        """
+        ticks = max(1, math.ceil(delay_ms / self.resolution))
+        timer = Timer(self._next_id, 0, 0, callback, ticks if repeat else None)
+        self._next_id += 1
+        self._insert(timer, self.current_tick + ticks)
+        return timer
+
+    def cancel(self, timer: Optional[Timer]) -> None:
+        """
+        Cancel a scheduled event. Cancelling None or a fired event is a no-op.
+        """
+        if timer is not None and timer.active:
+            self._log(timer)
+            timer.active = False
+            self._remove(timer)
+
+    def clear(self) -> None:
+        """
+        Cancel every scheduled event and reset game time to zero.
+        """
+        for slot in self.slots.values():
+            for timer in slot.values():
+                timer.active = False
+        self.slots = {}
+        self.current_tick = 0
+        self._pending_ms = 0
+        if self.journal is not None:
+            self.journal = []
+
+    def advance(self, elapsed_ms: int) -> None:
+        """
+        Move game time forward and fire every event that became due,
+        in deadline order (ties fire in scheduling order).
+        """
+        self._pending_ms += elapsed_ms
+        while self._pending_ms >= self.resolution:
+            self._pending_ms -= self.resolution
+            self.current_tick += 1
+            slot = self.slots.get(self.current_tick % self.size)
+            if slot is None:
+                continue
+            due = [t for t in slot.values() if t.deadline <= self.current_tick]
+            if len(due) > 1:
+                due.sort(key=lambda t: t.timer_id)  # rollback may reorder the slot dict
+            for timer in due:
+                if not timer.active:
+                    continue  # cancelled by an earlier callback this tick
+                self._log(timer)
+                self._remove(timer)
+                if timer.interval is not None:
+                    self._insert(timer, timer.deadline + timer.interval)
+                else:
+                    timer.active = False
+                timer.callback()
+
+    def copy(self, rebind: Callable[[Callable[[], None]], Callable[[], None]]) -> "TimerWheel":
+        """
+        Copy the wheel and its pending timers (without the journal).
+
+        Args:
+            rebind: Maps each timer's callback to the copy's callback, e.g.
+                a bound method of the original object to the same method
+                of its clone.
+        """
+        wheel = TimerWheel.__new__(TimerWheel)
+        wheel.resolution = self.resolution
+        wheel.size = self.size
+        wheel.slots = {
+            idx: {timer_id: timer.copy(rebind(timer.callback)) for timer_id, timer in slot.items()}
+            for idx, slot in self.slots.items()
+        }
+        wheel.current_tick = self.current_tick
+        wheel._pending_ms = self._pending_ms
+        wheel._next_id = self._next_id
+        wheel.journal = None
+        return wheel
+
+    # ----------------------------------------------------------------
+    #                        JOURNAL
+    # ----------------------------------------------------------------
+
+    def mark(self) -> Tuple[int, int, int, int]:
+        """
+        The current position for rollback(). Journaling must be enabled
+        (`wheel.journal = []`).
+        """
+        return len(self.journal), self.current_tick, self._pending_ms, self._next_id
+
+    def rollback(self, mark: Tuple[int, int, int, int]) -> None:
+        """
+        Undo every schedule, cancel and firing since `mark`, in reverse
+        order, and restore the game time. Callbacks are not undone.
+        """
+        position, self.current_tick, self._pending_ms, self._next_id = mark
+        journal = self.journal
+        while len(journal) > position:
+            timer, deadline, slot, active, scheduled = journal.pop()
+            if timer.timer_id in self.slots.get(timer.slot, ()):
+                self._remove(timer)
+            timer.deadline, timer.slot, timer.active = deadline, slot, active
+            if scheduled:
+                self.slots.setdefault(slot, {})[timer.timer_id] = timer
+
+    def _log(self, timer: Timer) -> None:
+        """Record a timer's placement before it changes."""
+        if self.journal is not None:
+            self.journal.append((
+                timer, timer.deadline, timer.slot, timer.active,
+                timer.timer_id in self.slots.get(timer.slot, ())
+            ))
+
+    def _insert(self, timer: Timer, deadline: int) -> None:
+        """Place a timer into the slot of its deadline tick."""
+        self._log(timer)
+        timer.deadline = deadline
+        timer.slot = deadline % self.size
+        self.slots.setdefault(timer.slot, {})[timer.timer_id] = timer
+
+    def _remove(self, timer: Timer) -> None:
+        """Take a timer out of its slot, dropping the slot once it is empty."""
+        slot = self.slots[timer.slot]
+        del slot[timer.timer_id]
+        if not slot:
+            del self.slots[timer.slot]
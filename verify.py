@@ -0,0 +1,321 @@
+"""
+Score verification: re-simulate submitted games before they are accepted.
+
+A submission is a replay dict (see replay.record_replay): seed, settings,
+input log, tick count, claimed score and player name. The verifier replays
+it headlessly with the game rules and accepts it only if it reaches exactly
+the claimed score in exactly the claimed number of ticks.
+
+ScoreVerifier verifies batches on a pool of worker processes and caches
+results by submission hash, so resubmitted games are answered at once.
+serve() exposes it on a small local HTTP endpoint for the leaderboard writer:
+
+    POST /verify    body: one submission or a list of them
+                    reply: one result or a list of results, in order
+    GET  /health    reply: {"status": "ok", ...}
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib import request as urlrequest
+
+from constants import DIFFICULTY_SPEED, VERIFY_HOST, VERIFY_PORT
+from replay import play_back
+from rules import DIRECTION_DELTAS, GAME_RULES
+
+Submission = Dict[str, Any]
+Result = Dict[str, Any]
+
+DEFAULT_HOST = VERIFY_HOST
+DEFAULT_PORT = VERIFY_PORT
+
+MAX_TICKS = 200000          # longest game accepted (more than 5 hours at top speed)
+MAX_TIME_LIMIT = 3600       # longest timed mode accepted, in seconds
+MAX_BODY_BYTES = 64 << 20   # largest HTTP request body
+CACHE_SIZE = 100000         # cached results
+BATCH_CHUNK = 32            # submissions per worker task
+
+# Fields that decide the verification result; the player name does not
+HASHED_FIELDS = ("seed", "game_mode", "difficulty", "time_limit", "inputs", "ticks", "score")
+
+
+def submission_hash(submission: Submission) -> str:
+    """
+    SHA-256 of the canonical JSON of the fields that decide the result.
+    """
+    key = {field: submission.get(field) for field in HASHED_FIELDS}
+    canonical = json.dumps(key, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def check_submission(submission: Any) -> Optional[str]:
+    """
+    Validate the shape of an untrusted submission before simulating it.
+
+    Returns:
+        None if it can be simulated, otherwise the reason it is rejected.
+    """
+    if not isinstance(submission, dict):
+        return "submission must be a JSON object"
+    if not _is_int(submission.get("seed")):
+        return "seed must be an integer"
+    if not _is_name(submission.get("game_mode"), GAME_RULES):
+        return f"unknown game_mode {submission.get('game_mode')!r}"
+    if not _is_name(submission.get("difficulty"), DIFFICULTY_SPEED):
+        return f"unknown difficulty {submission.get('difficulty')!r}"
+    time_limit = submission.get("time_limit")
+    if time_limit is not None and not (_is_int(time_limit) and 0 < time_limit <= MAX_TIME_LIMIT):
+        return "time_limit must be null or between 1 and 3600 seconds"
+    ticks = submission.get("ticks")
+    if not (_is_int(ticks) and 0 <= ticks <= MAX_TICKS):
+        return f"ticks must be an integer between 0 and {MAX_TICKS}"
+    if not _is_int(submission.get("score")):
+        return "score must be an integer"
+
+    inputs = submission.get("inputs")
+    if not isinstance(inputs, list):
+        return "inputs must be a list of [tick, direction]"
+    last_tick = -1
+    for item in inputs:
+        if not (isinstance(item, list) and len(item) == 2 and _is_int(item[0])):
+            return "inputs must be a list of [tick, direction]"
+        tick, direction = item
+        if not _is_name(direction, DIRECTION_DELTAS):
+            return f"unknown direction {direction!r}"
+        if not last_tick < tick < ticks:
+            return "input ticks must be increasing and below ticks"
+        last_tick = tick
+    return None
+
+
+def _is_int(value: Any) -> bool:
+    """True for ints, but not for bools (which JSON keeps apart)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_name(value: Any, names: Dict[str, Any]) -> bool:
+    """True if `value` is one of the keys of `names` (lists and dicts are not hashable)."""
+    return isinstance(value, str) and value in names
+
+
+def verify_submission(submission: Any) -> Result:
+    """
+    Re-simulate one submission.
+
+    Returns:
+        Dict with the submission hash, "valid", the simulated score and
+        ticks, and a "reason" when the submission is rejected.
+    """
+    digest = submission_hash(submission) if isinstance(submission, dict) else None
+    reason = check_submission(submission)
+    if reason:
+        return {"hash": digest, "valid": False, "reason": reason}
+
+    engine = None
+    for engine in play_back(submission):
+        pass
+
+    result = {"hash": digest, "valid": True, "score": engine.score, "ticks": engine.ticks}
+    if engine.ticks != submission["ticks"]:
+        result.update(valid=False, reason="the game ended before the recorded tick count")
+    elif engine.score != submission["score"]:
+        result.update(valid=False, reason=f"claimed score {submission['score']}, replay scores {engine.score}")
+    return result
+
+
+def verify_chunk(submissions: List[Submission]) -> List[Result]:
+    """
+    Worker task: verify a chunk of submissions. A submission that crashes
+    the simulation is rejected on its own instead of failing the chunk.
+    """
+    results = []
+    for submission in submissions:
+        try:
+            results.append(verify_submission(submission))
+        except Exception as exc:
+            results.append({
+                "hash": submission_hash(submission) if isinstance(submission, dict) else None,
+                "valid": False,
+                "reason": f"the replay could not be simulated: {exc!r}"
+            })
+    return results
+
+
+class ScoreVerifier:
+    """
+    Batch verifier with a worker pool and an LRU cache of results.
+    Safe to use from several threads (e.g. concurrent HTTP requests).
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache_size: int = CACHE_SIZE) -> None:
+        """
+        Args:
+            workers: Worker processes (default: one per CPU).
+            cache_size: Number of results kept in the cache.
+        """
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.cache: "OrderedDict[str, Result]" = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.stats = {"verified": 0, "cache_hits": 0, "rejected": 0}
+
+    def verify(self, submissions: List[Any]) -> List[Result]:
+        """
+        Verify a batch. Cached and duplicate submissions are simulated
+        only once; the rest are split into chunks for the worker pool.
+
+        Returns:
+            One result per submission, in order.
+        """
+        results: List[Optional[Result]] = [None] * len(submissions)
+        todo: Dict[str, List[int]] = {}
+        with self.lock:
+            for idx, submission in enumerate(submissions):
+                if not isinstance(submission, dict):
+                    results[idx] = verify_submission(submission)
+                    continue
+                digest = submission_hash(submission)
+                if digest in self.cache:
+                    self.cache.move_to_end(digest)
+                    results[idx] = self.cache[digest]
+                    self.stats["cache_hits"] += 1
+                else:
+                    todo.setdefault(digest, []).append(idx)
+
+        digests = list(todo)
+        chunks = [
+            [submissions[todo[digest][0]] for digest in digests[i:i + BATCH_CHUNK]]
+            for i in range(0, len(digests), BATCH_CHUNK)
+        ]
+        fresh = [result for chunk in self.pool.map(verify_chunk, chunks) for result in chunk]
+
+        with self.lock:
+            for digest, result in zip(digests, fresh):
+                for idx in todo[digest]:
+                    results[idx] = result
+                self.cache[digest] = result
+                self.stats["verified"] += 1
+                self.stats["rejected"] += not result["valid"]
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return results
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self.pool.shutdown()
+
+
+# ----------------------------------------------------------------
+#                        HTTP ENDPOINT
+# ----------------------------------------------------------------
+
+class VerifierHandler(BaseHTTPRequestHandler):
+    """
+    JSON request handler; the server's `verifier` attribute does the work.
+    """
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._reply(404, {"error": "not found"})
+            return
+        verifier = self.server.verifier
+        with verifier.lock:
+            status = dict(verifier.stats, status="ok", cached=len(verifier.cache))
+        self._reply(200, status)
+
+    def do_POST(self) -> None:
+        if self.path != "/verify":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._reply(400, {"error": "invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self._reply(413, {"error": "request body too large"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length))
+        except (ValueError, UnicodeDecodeError):
+            self._reply(400, {"error": "request body must be JSON"})
+            return
+
+        if isinstance(body, list):
+            self._reply(200, self.server.verifier.verify(body))
+        else:
+            self._reply(200, self.server.verifier.verify([body])[0])
+
+    def _reply(self, status: int, payload: Any) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # keep the console quiet under load
+
+
+def make_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: Optional[int] = None
+) -> ThreadingHTTPServer:
+    """
+    Create (but do not start) the verification HTTP server. Bind it to
+    localhost: it is meant for the leaderboard writer on the same machine.
+    """
+    server = ThreadingHTTPServer((host, port), VerifierHandler)
+    server.verifier = ScoreVerifier(workers)
+    return server
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None) -> None:
+    """Run the verification server until interrupted."""
+    server = make_server(host, port, workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.verifier.close()
+
+
+def request_verification(
+    submissions: List[Submission],
+    url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/verify",
+    timeout: float = 30.0
+) -> List[Result]:
+    """
+    Client for the leaderboard writer: send a batch to a running verifier.
+
+    Returns:
+        One result per submission, in order.
+    """
+    data = json.dumps(submissions).encode("utf-8")
+    req = urlrequest.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urlrequest.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def verify_score(submission: Submission, url: Optional[str] = None, timeout: float = 10.0) -> Result:
+    """
+    Verify one finished game before it is saved: on the verifier at `url`,
+    or in this process when `url` is None.
+
+    Raises:
+        OSError: If the verifier cannot be reached.
+        ValueError: If its reply is not JSON.
+    """
+    if url is None:
+        return verify_submission(submission)
+    return request_verification([submission], url, timeout)[0]